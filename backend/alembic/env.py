@@ -4,13 +4,14 @@ import os
 import sys
 from logging.config import fileConfig
 
-from sqlalchemy import engine_from_config, pool
+from sqlalchemy import engine_from_config, make_url, pool
 from alembic import context
 
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 
 from app.core.config import settings
 from app.db.base import Base
+from app.db.reflection import reset_inspector
 from app.models import action, assembly_line, champion, material, metalization, moulding, project, subtask, user  # noqa: F401
 
 config = context.config
@@ -40,6 +41,16 @@ def run_migrations_offline() -> None:
         context.run_migrations()
 
 
+def _executemany_options(url: str) -> dict[str, object]:
+    # Let drivers that support it send executemany UPDATEs/INSERTs as batches.
+    driver = make_url(url).get_driver_name()
+    if driver == "psycopg2":
+        return {"executemany_mode": "values_plus_batch"}
+    if driver == "pyodbc":
+        return {"fast_executemany": True}
+    return {}
+
+
 def run_migrations_online() -> None:
     configuration = config.get_section(config.config_ini_section, {})
     configuration["sqlalchemy.url"] = database_url
@@ -47,10 +58,19 @@ def run_migrations_online() -> None:
         configuration,
         prefix="sqlalchemy.",
         poolclass=pool.NullPool,
+        **_executemany_options(database_url),
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        def _reset_reflection(**_kwargs) -> None:
+            # Each revision may change the schema, so reflection is only shared within one step.
+            reset_inspector(connection)
+
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            on_version_apply=_reset_reflection,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
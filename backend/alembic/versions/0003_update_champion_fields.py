@@ -10,34 +10,53 @@ branch_labels = None
 depends_on = None
 
 
+def _normalize_name_sql(dialect_name: str) -> str:
+    # Same whitespace handling as str.split(): trimmed, with each whitespace run turned into one space.
+    if dialect_name == "postgresql":
+        name = r"btrim(regexp_replace(coalesce(name, ''), '\s+', ' ', 'g'))"
+    else:
+        name = "coalesce(name, '')"
+        for code in (9, 10, 11, 12, 13):
+            name = f"replace({name}, char({code}), ' ')"
+        # No regex replace here: each space becomes char(1) || char(2), every char(2) || char(1)
+        # between adjacent spaces is removed, and the remaining pair becomes one space again.
+        name = (
+            f"trim(replace(replace(replace({name}, ' ', char(1) || char(2)), "
+            "char(2) || char(1), ''), char(1) || char(2), ' '))"
+        )
+    return f"UPDATE champions SET name = {name}"
+
+
+def _split_name_sql(dialect_name: str) -> str:
+    # "First Rest of Name" -> ("First", "Rest of Name"); a single word becomes the last name.
+    # Runs after _normalize_name_sql, so names are trimmed and words are separated by single spaces.
+    if dialect_name == "postgresql":
+        space = "strpos(name, ' ')"
+    else:
+        space = "instr(name, ' ')"
+    return (
+        "UPDATE champions SET "
+        f"first_name = CASE WHEN {space} > 0 THEN substr(name, 1, {space} - 1) ELSE 'Unknown' END, "
+        f"last_name = CASE WHEN {space} > 0 THEN substr(name, {space} + 1) "
+        "WHEN name <> '' THEN name ELSE 'Unknown' END"
+    )
+
+
 def upgrade() -> None:
-    with op.batch_alter_table("champions") as batch:
-        batch.add_column(sa.Column("first_name", sa.String(length=150), nullable=True))
-        batch.add_column(sa.Column("last_name", sa.String(length=150), nullable=True))
-        batch.add_column(sa.Column("email", sa.String(length=255), nullable=True))
-        batch.add_column(sa.Column("position", sa.String(length=150), nullable=True))
-        batch.add_column(sa.Column("birth_date", sa.Date(), nullable=True))
-        batch.create_unique_constraint("uq_champions_email", ["email"])
+    # Nullable columns are plain ADD COLUMNs; everything that needs a SQLite table
+    # rebuild is done in the single batch below.
+    op.add_column("champions", sa.Column("first_name", sa.String(length=150), nullable=True))
+    op.add_column("champions", sa.Column("last_name", sa.String(length=150), nullable=True))
+    op.add_column("champions", sa.Column("email", sa.String(length=255), nullable=True))
+    op.add_column("champions", sa.Column("position", sa.String(length=150), nullable=True))
+    op.add_column("champions", sa.Column("birth_date", sa.Date(), nullable=True))
 
     connection = op.get_bind()
-    rows = connection.execute(sa.text("SELECT id, name FROM champions")).fetchall()
-    for row in rows:
-        raw_name = (row.name or "").strip()
-        parts = raw_name.split()
-        if len(parts) >= 2:
-            first_name = parts[0]
-            last_name = " ".join(parts[1:])
-        else:
-            first_name = "Unknown"
-            last_name = raw_name or "Unknown"
-        connection.execute(
-            sa.text(
-                "UPDATE champions SET first_name = :first_name, last_name = :last_name WHERE id = :id"
-            ),
-            {"id": row.id, "first_name": first_name, "last_name": last_name},
-        )
+    connection.execute(sa.text(_normalize_name_sql(connection.dialect.name)))
+    connection.execute(sa.text(_split_name_sql(connection.dialect.name)))
 
     with op.batch_alter_table("champions") as batch:
+        batch.create_unique_constraint("uq_champions_email", ["email"])
         batch.alter_column("first_name", nullable=False)
         batch.alter_column("last_name", nullable=False)
         # Dropping legacy name column after migrating data to structured fields.
@@ -45,19 +64,11 @@ def upgrade() -> None:
 
 
 def downgrade() -> None:
-    with op.batch_alter_table("champions") as batch:
-        batch.add_column(sa.Column("name", sa.String(length=255), nullable=True))
+    op.add_column("champions", sa.Column("name", sa.String(length=255), nullable=True))
 
-    connection = op.get_bind()
-    rows = connection.execute(
-        sa.text("SELECT id, first_name, last_name FROM champions")
-    ).fetchall()
-    for row in rows:
-        full_name = f"{row.first_name} {row.last_name}".strip()
-        connection.execute(
-            sa.text("UPDATE champions SET name = :name WHERE id = :id"),
-            {"id": row.id, "name": full_name},
-        )
+    op.execute(
+        sa.text("UPDATE champions SET name = trim(coalesce(first_name, '') || ' ' || coalesce(last_name, ''))")
+    )
 
     with op.batch_alter_table("champions") as batch:
         batch.alter_column("name", nullable=False)
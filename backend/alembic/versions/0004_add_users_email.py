@@ -2,7 +2,8 @@ from __future__ import annotations
 
 from alembic import op
 import sqlalchemy as sa
-from sqlalchemy import inspect
+
+from app.db.reflection import get_inspector
 
 
 revision = "0004_add_users_email"
@@ -15,8 +16,7 @@ EMAIL_COLUMN = sa.Column("email", sa.String(length=255), nullable=True)
 
 
 def _users_columns() -> set[str]:
-    bind = op.get_bind()
-    inspector = inspect(bind)
+    inspector = get_inspector(op.get_bind())
     if not inspector.has_table("users"):
         return set()
     return {column["name"] for column in inspector.get_columns("users")}
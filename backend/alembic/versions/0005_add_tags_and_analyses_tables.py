@@ -4,7 +4,8 @@ import json
 
 from alembic import op
 import sqlalchemy as sa
-from sqlalchemy import inspect
+
+from app.db.reflection import get_inspector
 
 
 revision = "0005_add_tags_and_analyses_tables"
@@ -13,15 +14,51 @@ branch_labels = None
 depends_on = None
 
 
+# Keeps the expanding IN (...) lookup well below SQLite's bound-parameter limit.
+LOOKUP_CHUNK_SIZE = 500
+STREAM_BATCH_SIZE = 10_000
+
+# Built once so the chunked lookup reuses one compiled statement.
+# Streaming is set on the statement, not on Alembic's shared connection, so later revisions don't inherit it.
+_SELECT_ACTION_TAGS = sa.text("SELECT id, tags FROM actions").execution_options(
+    stream_results=True, yield_per=STREAM_BATCH_SIZE
+)
+_INSERT_TAG = sa.text("INSERT INTO tags (name) VALUES (:name) ON CONFLICT DO NOTHING")
+_LOOKUP_TAG_IDS = sa.text("SELECT id, lower(name) FROM tags WHERE lower(name) IN :keys").bindparams(
+    sa.bindparam("keys", expanding=True)
+)
+_INSERT_ACTION_TAG = sa.text(
+    "INSERT INTO action_tags (action_id, tag_id) VALUES (:action_id, :tag_id) ON CONFLICT DO NOTHING"
+)
+
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional; the stdlib parser gives the same result, only slower.
+    _json_loads = json.loads
+
+
+def _as_tag_list(raw) -> tuple[str, ...]:
+    if isinstance(raw, (str, bytes)):
+        try:
+            raw = _json_loads(raw)
+        except ValueError:
+            return ()
+    if not isinstance(raw, list):
+        return ()
+    return tuple(value for value in (str(item).strip() for item in raw) if value)
+
+
 def _table_columns(table_name: str) -> set[str]:
-    inspector = inspect(op.get_bind())
+    inspector = get_inspector(op.get_bind())
     if not inspector.has_table(table_name):
         return set()
     return {column["name"] for column in inspector.get_columns(table_name)}
 
 
 def _has_table(table_name: str) -> bool:
-    inspector = inspect(op.get_bind())
+    inspector = get_inspector(op.get_bind())
     return table_name in inspector.get_table_names()
 
 
@@ -38,11 +75,14 @@ def upgrade() -> None:
             sa.Column("created_at", sa.Date(), nullable=False),
             sa.Column("closed_at", sa.Date(), nullable=True),
         )
-    if not _has_table("tags"):
+    # The unique index on tags.name is built after the backfill below so that the
+    # bulk insert does not maintain it row by row.
+    create_tags = not _has_table("tags")
+    if create_tags:
         op.create_table(
             "tags",
             sa.Column("id", sa.Integer(), primary_key=True),
-            sa.Column("name", sa.String(length=64), nullable=False, unique=True),
+            sa.Column("name", sa.String(length=64), nullable=False),
             sa.Column("color", sa.String(length=32), nullable=True),
         )
     if not _has_table("action_tags"):
@@ -60,39 +100,36 @@ def upgrade() -> None:
 
     if "tags" in _table_columns("actions"):
         bind = op.get_bind()
-        rows = bind.execute(sa.text("SELECT id, tags FROM actions")).fetchall()
-        tag_ids: dict[str, int] = {}
-        for row in rows:
-            action_id = row[0]
-            raw = row[1]
-            values: list[str] = []
-            if isinstance(raw, list):
-                values = [str(item).strip() for item in raw if str(item).strip()]
-            elif isinstance(raw, str) and raw.strip():
-                try:
-                    parsed = json.loads(raw)
-                    if isinstance(parsed, list):
-                        values = [str(item).strip() for item in parsed if str(item).strip()]
-                except json.JSONDecodeError:
-                    pass
-            for value in values:
+        rows = bind.execute(_SELECT_ACTION_TAGS)
+        tag_names: dict[str, str] = {}
+        links: list[tuple[int, str]] = []
+        for action_id, raw in rows:
+            for value in _as_tag_list(raw):
                 key = value.lower()
-                tag_id = tag_ids.get(key)
-                if tag_id is None:
-                    bind.execute(sa.text("INSERT INTO tags (name) VALUES (:name)"), {"name": value})
-                    tag_id = int(bind.execute(sa.text("SELECT id FROM tags WHERE lower(name)=:name"), {"name": key}).scalar_one())
-                    tag_ids[key] = tag_id
-                bind.execute(
-                    sa.text(
-                        "INSERT INTO action_tags (action_id, tag_id) VALUES (:action_id, :tag_id) "
-                        "ON CONFLICT DO NOTHING"
-                    ),
-                    {"action_id": action_id, "tag_id": tag_id},
-                )
+                tag_names.setdefault(key, value)
+                links.append((action_id, key))
+
+        if tag_names:
+            bind.execute(_INSERT_TAG, [{"name": name} for name in tag_names.values()])
+            keys = list(tag_names)
+            tag_ids: dict[str, int] = {}
+            # Migration-only index so the lower(name) lookup does not scan tags per chunk.
+            op.create_index("tmp_ix_tags_lower_name", "tags", [sa.text("lower(name)")])
+            for offset in range(0, len(keys), LOOKUP_CHUNK_SIZE):
+                chunk = keys[offset : offset + LOOKUP_CHUNK_SIZE]
+                tag_ids.update((key, int(tag_id)) for tag_id, key in bind.execute(_LOOKUP_TAG_IDS, {"keys": chunk}))
+            op.drop_index("tmp_ix_tags_lower_name", table_name="tags")
+            bind.execute(
+                _INSERT_ACTION_TAG,
+                [{"action_id": action_id, "tag_id": tag_ids[key]} for action_id, key in links],
+            )
 
         with op.batch_alter_table("actions") as batch:
             batch.drop_column("tags")
 
+    if create_tags:
+        op.create_index("uq_tags_name", "tags", ["name"], unique=True)
+
 
 def downgrade() -> None:
     with op.batch_alter_table("actions") as batch:
@@ -1,10 +1,9 @@
 from __future__ import annotations
 
-from datetime import datetime
-
 from alembic import op
 import sqlalchemy as sa
-from sqlalchemy import inspect
+
+from app.db.reflection import get_inspector
 
 
 revision = "0006_add_actions_updated_at"
@@ -14,7 +13,7 @@ depends_on = None
 
 
 def upgrade() -> None:
-    inspector = inspect(op.get_bind())
+    inspector = get_inspector(op.get_bind())
     if not inspector.has_table("actions"):
         return
 
@@ -22,16 +21,16 @@ def upgrade() -> None:
     if "updated_at" not in columns:
         op.add_column("actions", sa.Column("updated_at", sa.DateTime(), nullable=True))
 
-    now = datetime.utcnow()
     op.execute(
         sa.text(
-            "UPDATE actions SET updated_at = COALESCE(updated_at, created_at, :now)"
-        ).bindparams(now=now)
+            "UPDATE actions SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP) "
+            "WHERE updated_at IS NULL"
+        )
     )
 
 
 def downgrade() -> None:
-    inspector = inspect(op.get_bind())
+    inspector = get_inspector(op.get_bind())
     if not inspector.has_table("actions"):
         return
 
@@ -2,7 +2,8 @@ from __future__ import annotations
 
 from alembic import op
 import sqlalchemy as sa
-from sqlalchemy import inspect
+
+from app.db.reflection import get_inspector
 
 
 revision = "0008_harden_users_email_and_role"
@@ -12,16 +13,14 @@ depends_on = None
 
 
 def _users_columns() -> set[str]:
-    bind = op.get_bind()
-    inspector = inspect(bind)
+    inspector = get_inspector(op.get_bind())
     if not inspector.has_table("users"):
         return set()
     return {column["name"] for column in inspector.get_columns("users")}
 
 
 def _users_indexes() -> set[str]:
-    bind = op.get_bind()
-    inspector = inspect(bind)
+    inspector = get_inspector(op.get_bind())
     if not inspector.has_table("users"):
         return set()
     return {index["name"] for index in inspector.get_indexes("users")}
@@ -34,19 +33,20 @@ def upgrade() -> None:
 
     bind = op.get_bind()
 
+    # Nullable ADD COLUMN needs no table rebuild; the NOT NULL flip below is the only batch.
     if "role" not in columns:
-        with op.batch_alter_table("users") as batch:
-            batch.add_column(sa.Column("role", sa.String(length=50), nullable=True))
+        op.add_column("users", sa.Column("role", sa.String(length=50), nullable=True))
 
     if "email" not in columns:
-        with op.batch_alter_table("users") as batch:
-            batch.add_column(sa.Column("email", sa.String(length=255), nullable=True))
+        op.add_column("users", sa.Column("email", sa.String(length=255), nullable=True))
 
-    bind.execute(sa.text("UPDATE users SET role = 'viewer' WHERE role IS NULL OR trim(role) = ''"))
     bind.execute(
         sa.text(
-            "UPDATE users SET email = lower(username) || '@local.invalid' "
-            "WHERE email IS NULL OR trim(email) = ''"
+            "UPDATE users SET "
+            "role = CASE WHEN role IS NULL OR trim(role) = '' THEN 'viewer' ELSE role END, "
+            "email = CASE WHEN email IS NULL OR trim(email) = '' "
+            "THEN lower(username) || '@local.invalid' ELSE email END "
+            "WHERE role IS NULL OR trim(role) = '' OR email IS NULL OR trim(email) = ''"
         )
     )
 
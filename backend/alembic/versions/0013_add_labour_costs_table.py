@@ -32,19 +32,11 @@ def upgrade() -> None:
         sa.column("worker_type", sa.String),
         sa.column("cost_pln", sa.Float),
     )
-    connection = op.get_bind()
-    existing_rows = {
-        row[0]
-        for row in connection.execute(sa.select(labour_costs_table.c.worker_type)).fetchall()
-    }
-    for worker_type in LABOUR_COST_WORKER_TYPES:
-        if worker_type in existing_rows:
-            continue
-        op.bulk_insert(
-            labour_costs_table,
-            [{"worker_type": worker_type, "cost_pln": 0}],
-        )
-
+    # The table was created above, so it is empty and every worker type is seeded.
+    op.bulk_insert(
+        labour_costs_table,
+        [{"worker_type": worker_type, "cost_pln": 0} for worker_type in LABOUR_COST_WORKER_TYPES],
+    )
 
 
 def downgrade() -> None:
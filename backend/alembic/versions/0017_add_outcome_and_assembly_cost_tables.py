@@ -64,15 +64,12 @@ def upgrade() -> None:
         sa.CheckConstraint("qty_per_piece > 0", name="ck_assembly_line_materials_out_qty_per_piece_positive"),
     )
 
-    conn = op.get_bind()
-    rows = conn.execute(sa.text("SELECT id, hc FROM assembly_lines")).fetchall()
-    for line_id, hc in rows:
-        conn.execute(
-            sa.text(
-                "INSERT INTO assembly_line_hc (line_id, worker_type, hc) VALUES (:line_id, 'Operator', :hc)"
-            ),
-            {"line_id": line_id, "hc": float(hc or 0)},
+    op.execute(
+        sa.text(
+            "INSERT INTO assembly_line_hc (line_id, worker_type, hc) "
+            "SELECT id, 'Operator', CAST(COALESCE(hc, 0) AS FLOAT) FROM assembly_lines"
         )
+    )
 
 
 def downgrade() -> None:
@@ -16,15 +16,16 @@ depends_on = None
 
 
 def upgrade() -> None:
-    op.add_column("materials", sa.Column("category", sa.String(length=100), nullable=True))
-    op.add_column("materials", sa.Column("make_buy", sa.Boolean(), nullable=True))
-
-    op.execute(sa.text("UPDATE materials SET category = 'Raw material' WHERE category IS NULL"))
-    op.execute(sa.text("UPDATE materials SET make_buy = 0 WHERE make_buy IS NULL"))
+    # Constant defaults fill existing rows as part of ADD COLUMN, so no backfill UPDATE is needed.
+    op.add_column(
+        "materials",
+        sa.Column("category", sa.String(length=100), nullable=False, server_default="Raw material"),
+    )
+    op.add_column("materials", sa.Column("make_buy", sa.Boolean(), nullable=False, server_default=sa.false()))
 
     with op.batch_alter_table("materials") as batch_op:
-        batch_op.alter_column("category", existing_type=sa.String(length=100), nullable=False)
-        batch_op.alter_column("make_buy", existing_type=sa.Boolean(), nullable=False)
+        batch_op.alter_column("category", existing_type=sa.String(length=100), existing_nullable=False, server_default=None)
+        batch_op.alter_column("make_buy", existing_type=sa.Boolean(), existing_nullable=False, server_default=None)
 
 
 def downgrade() -> None:
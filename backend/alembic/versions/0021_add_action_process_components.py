@@ -23,25 +23,34 @@ def upgrade() -> None:
         sa.Column("action_id", sa.Integer(), sa.ForeignKey("actions.id", ondelete="CASCADE"), nullable=False),
         sa.Column("tool_id", sa.Integer(), sa.ForeignKey("moulding_tools.id", ondelete="CASCADE"), nullable=False),
         sa.PrimaryKeyConstraint("action_id", "tool_id"),
+        sqlite_with_rowid=False,
     )
+    op.create_index("ix_action_moulding_tools_tool_id", "action_moulding_tools", ["tool_id"])
 
     op.create_table(
         "action_metalization_masks",
         sa.Column("action_id", sa.Integer(), sa.ForeignKey("actions.id", ondelete="CASCADE"), nullable=False),
         sa.Column("mask_id", sa.Integer(), sa.ForeignKey("metalization_masks.id", ondelete="CASCADE"), nullable=False),
         sa.PrimaryKeyConstraint("action_id", "mask_id"),
+        sqlite_with_rowid=False,
     )
+    op.create_index("ix_action_metalization_masks_mask_id", "action_metalization_masks", ["mask_id"])
 
     op.create_table(
         "action_assembly_references",
         sa.Column("action_id", sa.Integer(), sa.ForeignKey("actions.id", ondelete="CASCADE"), nullable=False),
         sa.Column("reference_id", sa.Integer(), sa.ForeignKey("assembly_line_references.id", ondelete="CASCADE"), nullable=False),
         sa.PrimaryKeyConstraint("action_id", "reference_id"),
+        sqlite_with_rowid=False,
     )
+    op.create_index("ix_action_assembly_references_reference_id", "action_assembly_references", ["reference_id"])
 
 
 def downgrade() -> None:
+    op.drop_index("ix_action_assembly_references_reference_id", table_name="action_assembly_references", if_exists=True)
     op.drop_table("action_assembly_references")
+    op.drop_index("ix_action_metalization_masks_mask_id", table_name="action_metalization_masks", if_exists=True)
     op.drop_table("action_metalization_masks")
+    op.drop_index("ix_action_moulding_tools_tool_id", table_name="action_moulding_tools", if_exists=True)
     op.drop_table("action_moulding_tools")
     op.drop_column("actions", "process_type")
@@ -38,9 +38,12 @@ def upgrade() -> None:
         sa.Column("analysis_id", sa.String(length=64), sa.ForeignKey("analyses.id", ondelete="CASCADE"), nullable=False),
         sa.Column("action_id", sa.Integer(), sa.ForeignKey("actions.id", ondelete="CASCADE"), nullable=False),
         sa.PrimaryKeyConstraint("analysis_id", "action_id"),
+        sqlite_with_rowid=False,
     )
+    op.create_index("ix_analysis_actions_action_id", "analysis_actions", ["action_id"])
 
 
 def downgrade() -> None:
+    op.drop_index("ix_analysis_actions_action_id", table_name="analysis_actions", if_exists=True)
     op.drop_table("analysis_actions")
     op.drop_table("analysis_5why")
@@ -23,25 +23,40 @@ def upgrade() -> None:
         sa.Column("analysis_id", sa.String(length=64), sa.ForeignKey("analyses.id", ondelete="CASCADE"), nullable=False),
         sa.Column("tool_id", sa.Integer(), sa.ForeignKey("moulding_tools.id", ondelete="CASCADE"), nullable=False),
         sa.PrimaryKeyConstraint("analysis_id", "tool_id"),
+        sqlite_with_rowid=False,
     )
+    op.create_index("ix_analysis_5why_moulding_tools_tool_id", "analysis_5why_moulding_tools", ["tool_id"])
 
     op.create_table(
         "analysis_5why_metalization_masks",
         sa.Column("analysis_id", sa.String(length=64), sa.ForeignKey("analyses.id", ondelete="CASCADE"), nullable=False),
         sa.Column("mask_id", sa.Integer(), sa.ForeignKey("metalization_masks.id", ondelete="CASCADE"), nullable=False),
         sa.PrimaryKeyConstraint("analysis_id", "mask_id"),
+        sqlite_with_rowid=False,
     )
+    op.create_index("ix_analysis_5why_metalization_masks_mask_id", "analysis_5why_metalization_masks", ["mask_id"])
 
     op.create_table(
         "analysis_5why_assembly_references",
         sa.Column("analysis_id", sa.String(length=64), sa.ForeignKey("analyses.id", ondelete="CASCADE"), nullable=False),
         sa.Column("reference_id", sa.Integer(), sa.ForeignKey("assembly_line_references.id", ondelete="CASCADE"), nullable=False),
         sa.PrimaryKeyConstraint("analysis_id", "reference_id"),
+        sqlite_with_rowid=False,
+    )
+    op.create_index(
+        "ix_analysis_5why_assembly_references_reference_id", "analysis_5why_assembly_references", ["reference_id"]
     )
 
 
 def downgrade() -> None:
+    op.drop_index(
+        "ix_analysis_5why_assembly_references_reference_id",
+        table_name="analysis_5why_assembly_references",
+        if_exists=True,
+    )
     op.drop_table("analysis_5why_assembly_references")
+    op.drop_index("ix_analysis_5why_metalization_masks_mask_id", table_name="analysis_5why_metalization_masks", if_exists=True)
     op.drop_table("analysis_5why_metalization_masks")
+    op.drop_index("ix_analysis_5why_moulding_tools_tool_id", table_name="analysis_5why_moulding_tools", if_exists=True)
     op.drop_table("analysis_5why_moulding_tools")
     op.drop_column("analysis_5why", "observed_process_type")
@@ -7,6 +7,9 @@ Create Date: 2026-02-14
 
 from alembic import op
 import sqlalchemy as sa
+from sqlalchemy.schema import SchemaItem
+
+from app.db.reflection import get_inspector
 
 
 revision = "0024"
@@ -15,17 +18,32 @@ branch_labels = None
 depends_on = None
 
 
-def _rebuild_join_table(table_name: str, component_column: str, component_fk: str) -> None:
-    old_table = f"{table_name}_old"
+JOIN_TABLES = (
+    ("analysis_5why_moulding_tools", "tool_id", "moulding_tools.id"),
+    ("analysis_5why_metalization_masks", "mask_id", "metalization_masks.id"),
+    ("analysis_5why_assembly_references", "reference_id", "assembly_line_references.id"),
+)
 
-    op.rename_table(table_name, old_table)
 
-    op.create_table(
-        table_name,
+def _join_table_columns(component_column: str, component_fk: str) -> list[SchemaItem]:
+    return [
         sa.Column("analysis_id", sa.String(length=64), sa.ForeignKey("analyses.id", ondelete="CASCADE"), nullable=False),
         sa.Column(component_column, sa.Integer(), sa.ForeignKey(component_fk, ondelete="CASCADE"), nullable=False),
         sa.PrimaryKeyConstraint("analysis_id", component_column),
-    )
+    ]
+
+
+def _rebuild_join_table(table_name: str, component_column: str, component_fk: str) -> None:
+    old_table = f"{table_name}_old"
+    component_index = f"ix_{table_name}_{component_column}"
+
+    # Tables created by an older 0023 never had the component index.
+    indexes = get_inspector(op.get_bind()).get_indexes(table_name)
+    if any(index["name"] == component_index for index in indexes):
+        op.drop_index(component_index, table_name=table_name)
+    op.rename_table(table_name, old_table)
+
+    op.create_table(table_name, *_join_table_columns(component_column, component_fk), sqlite_with_rowid=False)
 
     op.execute(
         sa.text(
@@ -35,15 +53,26 @@ def _rebuild_join_table(table_name: str, component_column: str, component_fk: st
     )
 
     op.drop_table(old_table)
+    op.create_index(component_index, table_name, [component_column])
+
+
+def _has_cascading_fks(table_name: str) -> bool:
+    foreign_keys = get_inspector(op.get_bind()).get_foreign_keys(table_name)
+    return len(foreign_keys) == 2 and all(
+        (fk.get("options") or {}).get("ondelete", "").upper() == "CASCADE" for fk in foreign_keys
+    )
+
+
+def _apply() -> None:
+    # 0023 already creates these FKs with ON DELETE CASCADE, so fresh databases have nothing to rebuild.
+    for table_name, component_column, component_fk in JOIN_TABLES:
+        if not _has_cascading_fks(table_name):
+            _rebuild_join_table(table_name, component_column, component_fk)
 
 
 def upgrade() -> None:
-    _rebuild_join_table("analysis_5why_moulding_tools", "tool_id", "moulding_tools.id")
-    _rebuild_join_table("analysis_5why_metalization_masks", "mask_id", "metalization_masks.id")
-    _rebuild_join_table("analysis_5why_assembly_references", "reference_id", "assembly_line_references.id")
+    _apply()
 
 
 def downgrade() -> None:
-    _rebuild_join_table("analysis_5why_moulding_tools", "tool_id", "moulding_tools.id")
-    _rebuild_join_table("analysis_5why_metalization_masks", "mask_id", "metalization_masks.id")
-    _rebuild_join_table("analysis_5why_assembly_references", "reference_id", "assembly_line_references.id")
+    _apply()
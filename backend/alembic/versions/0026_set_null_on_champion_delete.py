@@ -15,9 +15,28 @@ branch_labels = None
 depends_on = None
 
 
-def _rebuild_actions(*, ondelete: str | None) -> None:
-    old_table = "actions_old_fk"
-    op.rename_table("actions", old_table)
+REBUILT_TABLES = ("projects", "actions", "users")
+# 256 MiB (negative values are KiB) so the staged copies and rebuilt tables stay in cache.
+REBUILD_CACHE_SIZE_KIB = 262_144
+
+
+def _stage_tables() -> bool:
+    # Copies live in the connection's TEMP schema (ATTACH is not allowed inside the migration
+    # transaction). Dropping instead of renaming leaves FKs in other tables pointing at the
+    # original names, which the rebuilt tables take over. Fresh databases have nothing to stage.
+    bind = op.get_bind()
+    copy_rows = any(
+        bind.execute(sa.text(f"SELECT 1 FROM {table_name} LIMIT 1")).first() is not None for table_name in REBUILT_TABLES
+    )
+    if copy_rows:
+        for table_name in REBUILT_TABLES:
+            op.execute(sa.text(f"CREATE TEMP TABLE {table_name}_old_fk AS SELECT * FROM {table_name}"))
+    for table_name in REBUILT_TABLES:
+        op.drop_table(table_name)
+    return copy_rows
+
+
+def _rebuild_actions(*, ondelete: str | None, copy_rows: bool) -> None:
     op.create_table(
         "actions",
         sa.Column("id", sa.Integer(), primary_key=True),
@@ -34,26 +53,26 @@ def _rebuild_actions(*, ondelete: str | None) -> None:
         sa.Column("updated_at", sa.DateTime(), nullable=True),
         sa.Column("process_type", sa.String(length=32), nullable=True),
     )
-    op.execute(
-        sa.text(
-            """
-            INSERT INTO actions (
-                id, title, description, project_id, champion_id, owner,
-                status, created_at, due_date, closed_at, priority, updated_at, process_type
+    if copy_rows:
+        op.execute(
+            sa.text(
+                """
+                INSERT INTO actions (
+                    id, title, description, project_id, champion_id, owner,
+                    status, created_at, due_date, closed_at, priority, updated_at, process_type
+                )
+                SELECT
+                    id, title, description, project_id, champion_id, owner,
+                    status, created_at, due_date, closed_at, priority, updated_at, process_type
+                FROM temp.actions_old_fk
+                ORDER BY id
+                """
             )
-            SELECT
-                id, title, description, project_id, champion_id, owner,
-                status, created_at, due_date, closed_at, priority, updated_at, process_type
-            FROM actions_old_fk
-            """
         )
-    )
-    op.drop_table(old_table)
+        op.drop_table("actions_old_fk", schema="temp")
 
 
-def _rebuild_projects(*, ondelete: str | None) -> None:
-    old_table = "projects_old_fk"
-    op.rename_table("projects", old_table)
+def _rebuild_projects(*, ondelete: str | None, copy_rows: bool) -> None:
     op.create_table(
         "projects",
         sa.Column("id", sa.Integer(), primary_key=True),
@@ -69,21 +88,21 @@ def _rebuild_projects(*, ondelete: str | None) -> None:
             nullable=True,
         ),
     )
-    op.execute(
-        sa.text(
-            """
-            INSERT INTO projects (id, name, due_date, status, max_volume, flex_percent, process_engineer_id)
-            SELECT id, name, due_date, status, max_volume, flex_percent, process_engineer_id
-            FROM projects_old_fk
-            """
+    if copy_rows:
+        op.execute(
+            sa.text(
+                """
+                INSERT INTO projects (id, name, due_date, status, max_volume, flex_percent, process_engineer_id)
+                SELECT id, name, due_date, status, max_volume, flex_percent, process_engineer_id
+                FROM temp.projects_old_fk
+                ORDER BY id
+                """
+            )
         )
-    )
-    op.drop_table(old_table)
+        op.drop_table("projects_old_fk", schema="temp")
 
 
-def _rebuild_users(*, ondelete: str | None) -> None:
-    old_table = "users_old_fk"
-    op.rename_table("users", old_table)
+def _rebuild_users(*, ondelete: str | None, copy_rows: bool) -> None:
     op.create_table(
         "users",
         sa.Column("id", sa.Integer(), primary_key=True),
@@ -94,36 +113,67 @@ def _rebuild_users(*, ondelete: str | None) -> None:
         sa.Column("champion_id", sa.Integer(), sa.ForeignKey("champions.id", ondelete=ondelete), nullable=True),
         sa.Column("is_active", sa.Boolean(), nullable=False, server_default=sa.text("1")),
         sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
-        sa.UniqueConstraint("username"),
-        sa.UniqueConstraint("email"),
     )
-    op.execute(
-        sa.text(
-            """
-            INSERT INTO users (id, username, email, password_hash, role, champion_id, is_active, created_at)
-            SELECT id, username, email, password_hash, role, champion_id, is_active, created_at
-            FROM users_old_fk
-            """
+    if copy_rows:
+        op.execute(
+            sa.text(
+                """
+                INSERT INTO users (id, username, email, password_hash, role, champion_id, is_active, created_at)
+                SELECT id, username, email, password_hash, role, champion_id, is_active, created_at
+                FROM temp.users_old_fk
+                ORDER BY id
+                """
+            )
         )
-    )
-    op.drop_table(old_table)
+        op.drop_table("users_old_fk", schema="temp")
+    # Built after the copy so each index is created in one sorted pass instead of row by row.
+    op.create_index("uq_users_username", "users", ["username"], unique=True)
+    op.create_index("uq_users_email", "users", ["email"], unique=True)
 
 
-def upgrade() -> None:
-    op.execute(sa.text("PRAGMA foreign_keys=OFF"))
+def _disable_foreign_keys() -> int:
+    # PRAGMA foreign_keys is a no-op inside an open transaction, and with enforcement on,
+    # dropping the staged tables would run ON DELETE CASCADE into their child tables.
+    bind = op.get_bind()
+    enabled = bind.execute(sa.text("PRAGMA foreign_keys")).scalar_one()
+    bind.execute(sa.text("PRAGMA foreign_keys=OFF"))
+    if bind.execute(sa.text("PRAGMA foreign_keys")).scalar_one():
+        raise RuntimeError(
+            "0026 rebuilds projects, actions and users and needs SQLite foreign key enforcement off; "
+            "run the migration on a connection without PRAGMA foreign_keys=ON."
+        )
+    return enabled
+
+
+def _foreign_key_violations() -> set[tuple]:
+    return {tuple(row) for row in op.get_bind().execute(sa.text("PRAGMA foreign_key_check")).all()}
+
+
+def _rebuild(*, ondelete: str | None) -> None:
+    bind = op.get_bind()
+    cache_size = bind.execute(sa.text("PRAGMA cache_size")).scalar_one()
+    foreign_keys = _disable_foreign_keys()
+    # Orphaned rows that predate this migration are left for the application to clean up;
+    # anything the rebuild itself breaks is fatal.
+    existing_violations = _foreign_key_violations()
+    op.execute(sa.text(f"PRAGMA cache_size=-{REBUILD_CACHE_SIZE_KIB}"))
     try:
-        _rebuild_projects(ondelete="SET NULL")
-        _rebuild_actions(ondelete="SET NULL")
-        _rebuild_users(ondelete="SET NULL")
+        copy_rows = _stage_tables()
+        _rebuild_projects(ondelete=ondelete, copy_rows=copy_rows)
+        _rebuild_actions(ondelete=ondelete, copy_rows=copy_rows)
+        _rebuild_users(ondelete=ondelete, copy_rows=copy_rows)
+        new_violations = sorted(_foreign_key_violations() - existing_violations, key=repr)
+        if new_violations:
+            details = ", ".join(f"{row[0]} rowid {row[1]} -> {row[2]}" for row in new_violations[:20])
+            raise RuntimeError(f"Foreign key check failed after rebuilding 0026 tables: {details}")
     finally:
-        op.execute(sa.text("PRAGMA foreign_keys=ON"))
+        op.execute(sa.text(f"PRAGMA cache_size={cache_size}"))
+        op.execute(sa.text(f"PRAGMA foreign_keys={foreign_keys}"))
+
+
+def upgrade() -> None:
+    _rebuild(ondelete="SET NULL")
 
 
 def downgrade() -> None:
-    op.execute(sa.text("PRAGMA foreign_keys=OFF"))
-    try:
-        _rebuild_projects(ondelete=None)
-        _rebuild_actions(ondelete=None)
-        _rebuild_users(ondelete=None)
-    finally:
-        op.execute(sa.text("PRAGMA foreign_keys=ON"))
+    _rebuild(ondelete=None)
@@ -0,0 +1,34 @@
+"""add indexes backing the actions list filters and sorts
+
+Revision ID: 0027
+Revises: 0026
+Create Date: 2026-02-15
+"""
+
+from alembic import op
+
+
+revision = "0027"
+down_revision = "0026"
+branch_labels = None
+depends_on = None
+
+
+INDEXES = (
+    ("ix_actions_status_due_date", "actions", ["status", "due_date"]),
+    ("ix_actions_champion_id_status_due_date", "actions", ["champion_id", "status", "due_date"]),
+    ("ix_actions_project_id_status_due_date", "actions", ["project_id", "status", "due_date"]),
+    ("ix_actions_created_at", "actions", ["created_at"]),
+    ("ix_action_tags_tag_id_action_id", "action_tags", ["tag_id", "action_id"]),
+    ("ix_subtasks_action_id", "subtasks", ["action_id"]),
+)
+
+
+def upgrade() -> None:
+    for index_name, table_name, columns in INDEXES:
+        op.create_index(index_name, table_name, columns)
+
+
+def downgrade() -> None:
+    for index_name, table_name, _columns in reversed(INDEXES):
+        op.drop_index(index_name, table_name=table_name)
@@ -0,0 +1,39 @@
+"""add component indexes to join tables created before 0021-0023 indexed them
+
+Revision ID: 0028
+Revises: 0027
+Create Date: 2026-02-16
+"""
+
+from alembic import op
+
+from app.db.reflection import get_inspector
+
+
+revision = "0028"
+down_revision = "0027"
+branch_labels = None
+depends_on = None
+
+
+INDEXES = (
+    ("ix_action_moulding_tools_tool_id", "action_moulding_tools", ["tool_id"]),
+    ("ix_action_metalization_masks_mask_id", "action_metalization_masks", ["mask_id"]),
+    ("ix_action_assembly_references_reference_id", "action_assembly_references", ["reference_id"]),
+    ("ix_analysis_actions_action_id", "analysis_actions", ["action_id"]),
+    ("ix_analysis_5why_moulding_tools_tool_id", "analysis_5why_moulding_tools", ["tool_id"]),
+    ("ix_analysis_5why_metalization_masks_mask_id", "analysis_5why_metalization_masks", ["mask_id"]),
+    ("ix_analysis_5why_assembly_references_reference_id", "analysis_5why_assembly_references", ["reference_id"]),
+)
+
+
+def upgrade() -> None:
+    inspector = get_inspector(op.get_bind())
+    for index_name, table_name, columns in INDEXES:
+        if not any(index["name"] == index_name for index in inspector.get_indexes(table_name)):
+            op.create_index(index_name, table_name, columns)
+
+
+def downgrade() -> None:
+    # Fresh databases get these indexes from 0021-0023, whose downgrades drop them.
+    pass
@@ -5,19 +5,34 @@ from typing import Annotated
 import logging
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from app.core.auth import enforce_action_create_permission, enforce_action_ownership, enforce_write_access, require_auth
+from app.core import cache
+from app.core.auth import (
+    cache_scope,
+    enforce_action_create_permission,
+    enforce_action_ownership,
+    enforce_write_access,
+    require_auth,
+)
 from app.db.session import get_db
 from app.models.action import ALLOWED_PROCESS_TYPES, Action
 from app.models.subtask import Subtask
 from app.models.user import User
 from app.repositories import actions as actions_repo
 from app.repositories import tags as tags_repo
-from app.schemas.action import ActionCreate, ActionDetailResponse, ActionListResponse, ActionRead, ActionUpdate
+from app.schemas.action import (
+    ActionCreate,
+    ActionDetailResponse,
+    ActionListResponse,
+    ActionProjectRef,
+    ActionRead,
+    ActionUpdate,
+)
 from app.schemas.subtask import SubtaskCreate, SubtaskRead, SubtaskUpdate
 from app.schemas.tag import TagRead
-from app.services.metrics import build_action_metrics
+from app.services.metrics import build_action_metrics, build_action_metrics_with_days_late
 from app.core.config import settings
 
 router = APIRouter(prefix="/api/actions", tags=["actions"])
@@ -45,14 +60,14 @@ def _clear_non_matching_components(action: Action) -> None:
         action.metalization_masks = []
 
 
-def _serialize_action(action: Action, metrics, include_metrics: bool = True) -> ActionRead:
-    return ActionRead(
+def _action_fields(action: Action, metrics) -> dict:
+    return dict(
         id=action.id,
         title=action.title,
         description=action.description,
         project_id=action.project_id,
         project_name=action.project.name if action.project else None,
-        project={"id": action.project.id, "name": action.project.name} if action.project else None,
+        project=ActionProjectRef.model_construct(id=action.project.id, name=action.project.name) if action.project else None,
         champion_id=action.champion_id,
         champion_name=action.champion.full_name if action.champion else None,
         owner=action.owner,
@@ -61,21 +76,28 @@ def _serialize_action(action: Action, metrics, include_metrics: bool = True) ->
         updated_at=action.updated_at,
         due_date=action.due_date,
         closed_at=action.closed_at,
-        tags=[TagRead.model_validate(tag) for tag in action.tags],
+        tags=[TagRead.model_construct(id=tag.id, name=tag.name, color=tag.color) for tag in action.tags],
         priority=action.priority,
         process_type=action.process_type,
         moulding_tool_ids=[tool.id for tool in action.moulding_tools],
         metalization_mask_ids=[mask.id for mask in action.metalization_masks],
         assembly_reference_ids=[reference.id for reference in action.assembly_references],
-        days_late=metrics.days_late if include_metrics else 0,
-        time_to_close_days=metrics.time_to_close_days if include_metrics else None,
-        on_time_close=metrics.on_time_close if include_metrics else None,
+        days_late=metrics.days_late,
+        time_to_close_days=metrics.time_to_close_days,
+        on_time_close=metrics.on_time_close,
     )
 
 
-@router.get("", response_model=ActionListResponse)
-def list_actions(
-    db: Session = Depends(get_db),
+# Rows come straight from the database, so responses skip per-field validation.
+def _construct_action(action: Action, metrics) -> ActionRead:
+    return ActionRead.model_construct(**_action_fields(action, metrics))
+
+
+def _serialize_detail(action: Action, metrics) -> ActionDetailResponse:
+    return ActionDetailResponse.model_construct(**_action_fields(action, metrics))
+
+
+def _list_filters(
     status_filters: Annotated[list[str] | None, Query(alias="status")] = None,
     champion_id: int | None = None,
     champion: str | None = None,
@@ -91,13 +113,12 @@ def list_actions(
     sort: str | None = None,
     limit: int = Query(default=200, ge=1, le=1000),
     offset: int = Query(default=0, ge=0),
-) -> ActionListResponse:
+) -> dict:
     normalized_sort = actions_repo.normalize_sort(sort)
     if settings.dev_mode:
         logger.info("API actions sort applied: %s", normalized_sort)
 
-    actions, total = actions_repo.list_actions(
-        db,
+    return dict(
         statuses=status_filters,
         champion_id=champion_id,
         champion_name=champion,
@@ -113,13 +134,36 @@ def list_actions(
         limit=limit,
         offset=offset,
     )
-    subtasks = actions_repo.list_subtasks_for_actions(db, [action.id for action in actions])
-    subtask_map: dict[int, list[Subtask]] = {}
-    for subtask in subtasks:
-        subtask_map.setdefault(subtask.action_id, []).append(subtask)
 
-    items = [_serialize_action(action, build_action_metrics(action, subtask_map.get(action.id, []))) for action in actions]
-    return ActionListResponse(total=total, items=items)
+
+def _list_items(db: Session, filters: dict) -> tuple[list[ActionRead], int]:
+    actions, total = actions_repo.list_actions(db, **filters)
+    days_late = actions_repo.days_late_by_action(db, [action.id for action in actions])
+    items = [
+        _construct_action(action, build_action_metrics_with_days_late(action, days_late.get(action.id, 0)))
+        for action in actions
+    ]
+    return items, total
+
+
+@router.get("", response_model=ActionListResponse)
+def list_actions(
+    db: Session = Depends(get_db),
+    filters: dict = Depends(_list_filters),
+    scope: tuple[int, str] | None = Depends(cache_scope),
+) -> ActionListResponse:
+    def build_response() -> ActionListResponse:
+        items, total = _list_items(db, filters)
+        return ActionListResponse.model_construct(total=total, items=items)
+
+    return cache.get_or_set(cache.make_key(db, "actions:list", scope=scope, **filters), build_response)
+
+
+@router.get("/stream", response_class=StreamingResponse)
+def stream_actions(db: Session = Depends(get_db), filters: dict = Depends(_list_filters)) -> StreamingResponse:
+    # Rows are loaded up front; each one is encoded only as the client reads it.
+    items, _total = _list_items(db, filters)
+    return StreamingResponse((item.model_dump_json() + "\n" for item in items), media_type="application/x-ndjson")
 
 
 @router.post("", response_model=ActionDetailResponse, status_code=status.HTTP_201_CREATED)
@@ -144,9 +188,9 @@ def create_action(
         process_type=payload.process_type,
     )
     _clear_non_matching_components(action)
-    action.tags = [tags_repo.get_or_create_tag(db, name) for name in payload.tags]
+    action.tags = tags_repo.get_or_create_tags(db, payload.tags)
     action = actions_repo.create_action(db, action)
-    return _serialize_action(action, build_action_metrics(action, []))
+    return _serialize_detail(action, build_action_metrics(action, []))
 
 
 @router.get("/{action_id}", response_model=ActionDetailResponse)
@@ -155,7 +199,7 @@ def get_action(action_id: int, db: Session = Depends(get_db)) -> ActionDetailRes
     if not action:
         raise HTTPException(status_code=404, detail="Action not found")
     subtasks = actions_repo.list_subtasks(db, action_id)
-    return _serialize_action(action, build_action_metrics(action, subtasks))
+    return _serialize_detail(action, build_action_metrics(action, subtasks))
 
 
 @router.patch("/{action_id}", response_model=ActionDetailResponse)
@@ -181,35 +225,31 @@ def update_action(
     if "process_type" in updates:
         _clear_non_matching_components(action)
     if tags is not None:
-        action.tags = [tags_repo.get_or_create_tag(db, name) for name in tags]
+        action.tags = tags_repo.get_or_create_tags(db, tags)
 
     action = actions_repo.update_action(db, action)
     subtasks = actions_repo.list_subtasks(db, action_id)
-    return _serialize_action(action, build_action_metrics(action, subtasks))
+    return _serialize_detail(action, build_action_metrics(action, subtasks))
 
 
 @router.post("/{action_id}/tags/{tag_id}", response_model=ActionDetailResponse)
 def add_action_tag(action_id: int, tag_id: int, db: Session = Depends(get_db)) -> ActionDetailResponse:
-    action = actions_repo.get_action(db, action_id)
-    tag = tags_repo.get_tag(db, tag_id)
-    if not action or not tag:
+    if not actions_repo.action_exists(db, action_id) or not tags_repo.get_tag(db, tag_id):
         raise HTTPException(status_code=404, detail="Action or tag not found")
-    if tag not in action.tags:
-        action.tags.append(tag)
-    action = actions_repo.update_action(db, action)
+    actions_repo.add_action_tag(db, action_id, tag_id)
+    action = actions_repo.get_action(db, action_id)
     subtasks = actions_repo.list_subtasks(db, action_id)
-    return _serialize_action(action, build_action_metrics(action, subtasks))
+    return _serialize_detail(action, build_action_metrics(action, subtasks))
 
 
 @router.delete("/{action_id}/tags/{tag_id}", response_model=ActionDetailResponse)
 def remove_action_tag(action_id: int, tag_id: int, db: Session = Depends(get_db)) -> ActionDetailResponse:
-    action = actions_repo.get_action(db, action_id)
-    if not action:
+    if not actions_repo.action_exists(db, action_id):
         raise HTTPException(status_code=404, detail="Action not found")
-    action.tags = [tag for tag in action.tags if tag.id != tag_id]
-    action = actions_repo.update_action(db, action)
+    actions_repo.remove_action_tag(db, action_id, tag_id)
+    action = actions_repo.get_action(db, action_id)
     subtasks = actions_repo.list_subtasks(db, action_id)
-    return _serialize_action(action, build_action_metrics(action, subtasks))
+    return _serialize_detail(action, build_action_metrics(action, subtasks))
 
 
 @router.delete("/{action_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -265,10 +305,10 @@ def update_subtask(
     db: Session = Depends(get_db),
     user: User | None = Depends(require_auth),
 ) -> SubtaskRead:
-    subtask = actions_repo.get_subtask(db, subtask_id)
+    subtask = actions_repo.get_subtask_with_action(db, subtask_id)
     if not subtask:
         raise HTTPException(status_code=404, detail="Subtask not found")
-    action = actions_repo.get_action(db, subtask.action_id)
+    action = subtask.action
     if not action:
         raise HTTPException(status_code=404, detail="Action not found")
     enforce_write_access(user)
@@ -285,10 +325,10 @@ def delete_subtask(
     db: Session = Depends(get_db),
     user: User | None = Depends(require_auth),
 ) -> None:
-    subtask = actions_repo.get_subtask(db, subtask_id)
+    subtask = actions_repo.get_subtask_with_action(db, subtask_id)
     if not subtask:
         raise HTTPException(status_code=404, detail="Subtask not found")
-    action = actions_repo.get_action(db, subtask.action_id)
+    action = subtask.action
     if not action:
         raise HTTPException(status_code=404, detail="Action not found")
     enforce_write_access(user)
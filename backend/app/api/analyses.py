@@ -3,6 +3,8 @@ from __future__ import annotations
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
+from app.core import cache
+from app.core.auth import cache_scope
 from app.db.session import get_db
 from app.repositories import analyses as analyses_repo
 from app.repositories import tags as tags_repo
@@ -33,9 +35,14 @@ def list_analyses(
     tags: list[str] | None = Query(default=None),
     limit: int = Query(default=200, ge=1, le=1000),
     offset: int = Query(default=0, ge=0),
+    scope: tuple[int, str] | None = Depends(cache_scope),
 ):
-    rows, total = analyses_repo.list_analyses(db, tags=tags, limit=limit, offset=offset)
-    return AnalysisListResponse(total=total, items=[_serialize(row) for row in rows])
+    def build_response() -> AnalysisListResponse:
+        rows, total = analyses_repo.list_analyses(db, tags=tags, limit=limit, offset=offset)
+        return AnalysisListResponse(total=total, items=[_serialize(row) for row in rows])
+
+    key = cache.make_key(db, "analyses:list", scope=scope, tags=tags, limit=limit, offset=offset)
+    return cache.get_or_set(key, build_response)
 
 
 @router.post("", response_model=AnalysisRead, status_code=status.HTTP_201_CREATED)
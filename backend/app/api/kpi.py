@@ -6,10 +6,11 @@ from typing import Annotated
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
+from app.core import cache
+from app.core.auth import cache_scope
 from app.db.session import get_db
 from app.repositories import actions as actions_repo
 from app.schemas.kpi import ActionsKPI
-from app.services.kpi import build_actions_kpi
 
 router = APIRouter(prefix="/api/kpi", tags=["kpi"])
 
@@ -27,9 +28,9 @@ def get_actions_kpi(
     tags: list[str] | None = Query(default=None),
     from_date: date | None = Query(default=None, alias="from"),
     to_date: date | None = Query(default=None, alias="to"),
+    scope: tuple[int, str] | None = Depends(cache_scope),
 ) -> ActionsKPI:
-    actions, _total = actions_repo.list_actions(
-        db,
+    filters = dict(
         statuses=status_filters,
         champion_id=champion_id,
         champion_name=champion,
@@ -43,6 +44,8 @@ def get_actions_kpi(
         limit=1000,
         offset=0,
     )
-    subtasks = actions_repo.list_subtasks_for_actions(db, [action.id for action in actions])
-    kpi_payload = build_actions_kpi(actions, subtasks)
-    return ActionsKPI(**kpi_payload)
+
+    def build_response() -> ActionsKPI:
+        return ActionsKPI(**actions_repo.aggregate_kpi(db, **filters))
+
+    return cache.get_or_set(cache.make_key(db, "kpi:actions", scope=scope, **filters), build_response)
@@ -1,29 +1,28 @@
 from __future__ import annotations
 
-from datetime import datetime
-
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
 from app.repositories import actions as actions_repo
 from app.repositories import projects as projects_repo
-from app.schemas.action import ActionRead
-from app.schemas.project import ProjectRead
+from app.schemas.action import ActionProjectRef, ActionRead
+from app.schemas.project import ProjectAssignmentLineRead, ProjectAssignmentToolRead, ProjectRead
 from app.schemas.tag import TagRead
-from app.services.metrics import build_action_metrics
+from app.services.metrics import build_action_metrics, build_action_metrics_with_days_late
 
 router = APIRouter(prefix="/api/projects", tags=["projects"])
 
 
+# Rows come straight from the database, so responses skip per-field validation.
 def _serialize_action(action, metrics) -> ActionRead:
-    return ActionRead(
+    return ActionRead.model_construct(
         id=action.id,
         title=action.title,
         description=action.description,
         project_id=action.project_id,
         project_name=action.project.name if action.project else None,
-        project={"id": action.project.id, "name": action.project.name} if action.project else None,
+        project=ActionProjectRef.model_construct(id=action.project.id, name=action.project.name) if action.project else None,
         champion_id=action.champion_id,
         champion_name=action.champion.full_name if action.champion else None,
         owner=action.owner,
@@ -32,7 +31,7 @@ def _serialize_action(action, metrics) -> ActionRead:
         updated_at=action.updated_at,
         due_date=action.due_date,
         closed_at=action.closed_at,
-        tags=[TagRead.model_validate(tag) for tag in action.tags],
+        tags=[TagRead.model_construct(id=tag.id, name=tag.name, color=tag.color) for tag in action.tags],
         priority=action.priority,
         days_late=metrics.days_late,
         time_to_close_days=metrics.time_to_close_days,
@@ -40,9 +39,29 @@ def _serialize_action(action, metrics) -> ActionRead:
     )
 
 
+def _project_to_read(project) -> ProjectRead:
+    return ProjectRead.model_construct(
+        id=project.id,
+        name=project.name,
+        due_date=project.due_date,
+        status=project.status,
+        max_volume=project.max_volume,
+        flex_percent=project.flex_percent,
+        process_engineer_id=project.process_engineer_id,
+        moulding_tools=[
+            ProjectAssignmentToolRead.model_construct(id=tool.id, tool_pn=tool.tool_pn, description=tool.description)
+            for tool in project.moulding_tools
+        ],
+        assembly_lines=[
+            ProjectAssignmentLineRead.model_construct(id=line.id, line_number=line.line_number)
+            for line in project.assembly_lines
+        ],
+    )
+
+
 @router.get("", response_model=list[ProjectRead])
 def list_projects(db: Session = Depends(get_db)) -> list[ProjectRead]:
-    return [ProjectRead.model_validate(project) for project in projects_repo.list_projects(db)]
+    return [_project_to_read(project) for project in projects_repo.list_projects(db)]
 
 
 @router.get("/{project_id}", response_model=ProjectRead)
@@ -50,7 +69,7 @@ def get_project(project_id: int, db: Session = Depends(get_db)) -> ProjectRead:
     project = projects_repo.get_project(db, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
-    return ProjectRead.model_validate(project)
+    return _project_to_read(project)
 
 
 @router.get("/{project_id}/actions", response_model=list[ActionRead])
@@ -60,11 +79,11 @@ def list_project_actions(project_id: int, db: Session = Depends(get_db)) -> list
         raise HTTPException(status_code=404, detail="Project not found")
 
     actions = actions_repo.list_actions_by_project(db, project_id)
-    subtasks = actions_repo.list_subtasks_for_actions(db, [action.id for action in actions])
-    subtask_map: dict[int, list] = {}
-    for subtask in subtasks:
-        subtask_map.setdefault(subtask.action_id, []).append(subtask)
-    return [_serialize_action(action, build_action_metrics(action, subtask_map.get(action.id, []))) for action in actions]
+    days_late = actions_repo.days_late_by_action(db, [action.id for action in actions])
+    return [
+        _serialize_action(action, build_action_metrics_with_days_late(action, days_late.get(action.id, 0)))
+        for action in actions
+    ]
 
 
 @router.post("/{project_id}/actions/{action_id}", response_model=ActionRead)
@@ -82,12 +101,11 @@ def assign_action_to_project(project_id: int, action_id: int, db: Session = Depe
         return _serialize_action(action, build_action_metrics(action, subtasks))
 
     if action.project_id is not None and action.project_id != project_id:
-        existing_project = projects_repo.get_project(db, action.project_id)
+        existing_project = action.project
         project_label = f"{existing_project.name} ({existing_project.id})" if existing_project else str(action.project_id)
         raise HTTPException(status_code=409, detail=f"Action is already assigned to project {project_label}")
 
     action.project_id = project_id
-    action.updated_at = datetime.utcnow()
     action = actions_repo.update_action(db, action)
     subtasks = actions_repo.list_subtasks(db, action.id)
     return _serialize_action(action, build_action_metrics(action, subtasks))
@@ -107,7 +125,6 @@ def unassign_action_from_project(project_id: int, action_id: int, db: Session =
         raise HTTPException(status_code=404, detail="Action is not assigned to this project")
 
     action.project_id = None
-    action.updated_at = datetime.utcnow()
     action = actions_repo.update_action(db, action)
     subtasks = actions_repo.list_subtasks(db, action.id)
     return _serialize_action(action, build_action_metrics(action, subtasks))
@@ -10,9 +10,13 @@ from app.schemas.tag import TagCreate, TagRead
 router = APIRouter(prefix="/api/tags", tags=["tags"])
 
 
+def _tag_to_read(tag) -> TagRead:
+    return TagRead.model_construct(id=tag.id, name=tag.name, color=tag.color)
+
+
 @router.get("", response_model=list[TagRead])
 def list_tags(db: Session = Depends(get_db)) -> list[TagRead]:
-    return [TagRead.model_validate(tag) for tag in tags_repo.list_tags(db)]
+    return [_tag_to_read(tag) for tag in tags_repo.list_tags(db)]
 
 
 @router.post("", response_model=TagRead, status_code=status.HTTP_201_CREATED)
@@ -21,5 +25,5 @@ def create_tag(payload: TagCreate, db: Session = Depends(get_db)) -> TagRead:
         raise HTTPException(status_code=400, detail="Tag name is required")
     existing = tags_repo.get_tag_by_name(db, payload.name)
     if existing:
-        return TagRead.model_validate(existing)
-    return TagRead.model_validate(tags_repo.create_tag(db, payload.name, payload.color))
+        return _tag_to_read(existing)
+    return _tag_to_read(tags_repo.create_tag(db, payload.name, payload.color))
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import hashlib
+import logging
+
 from fastapi import Depends, HTTPException, Request, status
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, make_transient_to_detached
 
+from app.core import cache
 from app.core.config import settings
 from app.core.security import decode_session_token
 from app.db.session import get_db
@@ -12,19 +16,51 @@ from app.repositories import actions as actions_repo
 from app.repositories import users as users_repo
 
 
+logger = logging.getLogger("app.request")
+
+_UNRESOLVED = object()
+
+
+class UILoginRequired(Exception):
+    pass
+
+
 def get_current_user_optional(request: Request, db: Session) -> User | None:
     if not settings.auth_enabled:
         return None
+    # Resolved at most once per request; None is a valid cached result, hence the sentinel.
+    cached = getattr(request.state, "auth_user", _UNRESOLVED)
+    if cached is not _UNRESOLVED:
+        return cached
+    user = _resolve_session_user(request, db)
+    request.state.auth_user = user
+    return user
+
+
+def _resolve_session_user(request: Request, db: Session) -> User | None:
     token = request.cookies.get(settings.session_cookie_name)
     if not token:
         return None
-    payload = decode_session_token(token, settings.session_ttl_days * 24 * 60 * 60)
+    # Shares the response cache's TTL and write invalidation, so role or activation changes
+    # apply on the next request. Keyed by a digest so raw tokens are not held in memory.
+    key = cache.make_key(db, "auth:session_user", token=hashlib.blake2s(token.encode()).digest())
+    snapshot = cache.get_or_set(key, lambda: _load_session_user(db, token))
+    if snapshot is None:
+        return None
+    return db.merge(snapshot, load=False)
+
+
+def _load_session_user(db: Session, token: str) -> User | None:
+    payload = decode_session_token(token, settings.session_ttl_seconds)
     if not payload:
         return None
     user = users_repo.get_user_by_id(db, int(payload.get("uid", 0)))
     if not user or not user.is_active:
         return None
-    return user
+    # A detached copy, so the cached entry is never expired or mutated by the loading session.
+    snapshot = User(**{column.key: getattr(user, column.key) for column in User.__table__.columns})
+    make_transient_to_detached(snapshot)
+    return snapshot
 
 
 def require_auth(request: Request, db: Session = Depends(get_db)) -> User | None:
@@ -36,20 +72,41 @@ def require_auth(request: Request, db: Session = Depends(get_db)) -> User | None
     return user
 
 
-def require_role_admin(user: User | None = Depends(require_auth)) -> User | None:
-    if not settings.auth_enabled:
-        return user
-    if not user or user.role != "admin":
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+def cache_scope(user: User | None = Depends(require_auth)) -> tuple[int, str] | None:
+    # Cached API responses are keyed by caller so one user's response is never served to another.
+    return None if user is None else (user.id, user.role)
+
+
+def get_ui_user(request: Request, db: Session = Depends(get_db)) -> User | None:
+    # Uses the request's own session, so UI pages check out one connection for auth and rendering.
+    try:
+        user = get_current_user_optional(request, db)
+    except Exception:
+        logger.exception("Failed to resolve UI session for %s", request.url.path)
+        db.rollback()
+        user = None
+    request.state.user = user
     return user
 
 
-def require_role_viewer_or_higher(user: User | None = Depends(require_auth)) -> User | None:
-    if not settings.auth_enabled:
-        return user
+def require_ui_user(user: User | None = Depends(get_ui_user)) -> User | None:
+    if settings.auth_enabled and not user:
+        raise UILoginRequired()
+    return user
+
+
+def require_role_admin(request: Request, db: Session = Depends(get_db)) -> User | None:
+    # Resolves and checks in one dependency rather than chaining Depends(require_auth).
+    user = require_auth(request, db)
+    if user and user.role != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
     return user
 
 
+def require_role_viewer_or_higher(request: Request, db: Session = Depends(get_db)) -> User | None:
+    return require_auth(request, db)
+
+
 def require_can_edit_action(
     action_id: int,
     db: Session = Depends(get_db),
@@ -58,15 +115,14 @@ def require_can_edit_action(
     action = actions_repo.get_action(db, action_id)
     if not action:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Action not found")
-    if not settings.auth_enabled:
-        return action
-    if not user:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
-    if user.role == "admin":
-        return action
-    if user.role == "champion" and user.champion_id and action.champion_id == user.champion_id:
-        return action
-    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
+    enforce_action_ownership(user, action)
+    return action
+
+
+def _can_edit(user: User, champion_id: int | None) -> bool:
+    return user.role == "admin" or (
+        user.role == "champion" and user.champion_id is not None and user.champion_id == champion_id
+    )
 
 
 def enforce_write_access(user: User | None) -> None:
@@ -83,20 +139,16 @@ def enforce_action_ownership(user: User | None, action: Action) -> None:
         return
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
-    if user.role == "admin":
-        return
-    if user.role == "champion" and user.champion_id and action.champion_id == user.champion_id:
-        return
-    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
+    if not _can_edit(user, action.champion_id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
 
 
 def enforce_action_create_permission(user: User | None, champion_id: int | None) -> None:
     if not settings.auth_enabled:
         return
     enforce_write_access(user)
-    if user and user.role == "champion":
-        if not user.champion_id or champion_id != user.champion_id:
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Champion access required")
+    if user and user.role == "champion" and not _can_edit(user, champion_id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Champion access required")
 
 
 def enforce_admin(user: User | None) -> None:
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable, Hashable
+from typing import Any, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+
+T = TypeVar("T")
+
+# Read responses are cached per process for a short TTL and dropped whenever any session
+# commits a write, so UI and API mutations are visible on the next request.
+_DIRTY_KEY = "response_cache_dirty"
+
+_lock = threading.Lock()
+_entries: dict[Hashable, tuple[float, int, Any]] = {}
+_generation = 0
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, (list, tuple, set)):
+        return tuple(sorted(_freeze(item) for item in value))
+    return value
+
+
+def make_key(db: Session, prefix: str, *, scope: Hashable = None, **params: Any) -> Hashable:
+    params_key = tuple(sorted((name, _freeze(value)) for name, value in params.items()))
+    return (prefix, str(db.get_bind().url), scope, params_key)
+
+
+def get_or_set(key: Hashable, factory: Callable[[], T], ttl: float | None = None) -> T:
+    ttl = settings.api_cache_ttl_seconds if ttl is None else ttl
+    if ttl <= 0:
+        return factory()
+    now = time.monotonic()
+    with _lock:
+        generation = _generation
+        entry = _entries.get(key)
+    if entry is not None and entry[0] > now and entry[1] == generation:
+        return entry[2]
+    value = factory()
+    with _lock:
+        # Skip storing if a write was committed while the value was being built.
+        if generation == _generation:
+            _store(key, (now + ttl, generation, value), now)
+    return value
+
+
+def _store(key: Hashable, entry: tuple[float, int, Any], now: float) -> None:
+    # Entries are kept in insertion order, which with a shared TTL is also expiry order, so
+    # expired entries and, once the cache is full, the oldest live ones are dropped from the front.
+    _entries.pop(key, None)
+    while _entries:
+        oldest = next(iter(_entries))
+        if _entries[oldest][0] > now and len(_entries) < settings.api_cache_max_entries:
+            break
+        del _entries[oldest]
+    _entries[key] = entry
+
+
+def invalidate() -> None:
+    global _generation
+    with _lock:
+        _generation += 1
+        _entries.clear()
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_dirty_after_flush(session: Session, _flush_context) -> None:
+    if session.new or session.dirty or session.deleted:
+        session.info[_DIRTY_KEY] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_dirty_on_bulk_write(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[_DIRTY_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    if session.info.pop(_DIRTY_KEY, False):
+        invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_dirty_after_rollback(session: Session) -> None:
+    session.info.pop(_DIRTY_KEY, None)
@@ -4,6 +4,9 @@ from pathlib import Path
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+DEFAULT_DATABASE_PATH = Path(__file__).resolve().parents[3] / "data" / "actions_api.db"
+
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_prefix="", case_sensitive=False)
 
@@ -16,6 +19,15 @@ class Settings(BaseSettings):
     admin_password: str | None = None
     session_cookie_name: str = "capa_session"
     session_ttl_days: int = 7
+    # Switching the signing algorithm invalidates sessions issued under the other one.
+    session_token_blake2b: bool = False
+    worker_threads: int = 40
+    api_cache_ttl_seconds: float = 30.0
+    api_cache_max_entries: int = 10_000
+
+    @property
+    def session_ttl_seconds(self) -> int:
+        return self.session_ttl_days * 24 * 60 * 60
 
     @property
     def session_cookie_secure(self) -> bool:
@@ -37,9 +49,7 @@ class Settings(BaseSettings):
     def sqlalchemy_database_uri(self) -> str:
         if self.database_url:
             return self.database_url
-        repo_root = Path(__file__).resolve().parents[3]
-        default_path = repo_root / "data" / "actions_api.db"
-        return f"sqlite:///{default_path}"
+        return f"sqlite:///{DEFAULT_DATABASE_PATH}"
 
     @property
     def DATABASE_URL(self) -> str:
@@ -1,6 +1,12 @@
 from __future__ import annotations
 
+import hashlib
+import os
+from functools import lru_cache
+
+import anyio.to_thread
 from itsdangerous import BadSignature, SignatureExpired, URLSafeTimedSerializer
+from itsdangerous.signer import SigningAlgorithm
 from passlib.context import CryptContext
 
 from app.core.config import settings
@@ -8,6 +14,9 @@ from app.core.config import settings
 _pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 _MAX_BCRYPT_PASSWORD_BYTES = 72
 _SESSION_SALT = "capa-session"
+# bcrypt is CPU-bound and releases the GIL, so more concurrent hashes than cores only queue up.
+# A dedicated limiter also keeps login bursts from using the default worker thread tokens.
+_BCRYPT_LIMITER = anyio.CapacityLimiter(max(2, os.cpu_count() or 1))
 
 
 def is_password_too_long(password: str) -> bool:
@@ -24,8 +33,25 @@ def verify_password(password: str, password_hash: str) -> bool:
     return _pwd_context.verify(password, password_hash)
 
 
+async def averify_password(password: str, password_hash: str) -> bool:
+    return await anyio.to_thread.run_sync(verify_password, password, password_hash, limiter=_BCRYPT_LIMITER)
+
+
+class _Blake2bSigningAlgorithm(SigningAlgorithm):
+    # Keyed BLAKE2b is a MAC on its own, so it replaces HMAC-SHA1 without the HMAC wrapping.
+    def get_signature(self, key: bytes, value: bytes) -> bytes:
+        return hashlib.blake2b(value, key=key, digest_size=16).digest()
+
+
+@lru_cache(maxsize=1)
+def _serializer_for(secret_key: str, use_blake2b: bool) -> URLSafeTimedSerializer:
+    signer_kwargs = {"algorithm": _Blake2bSigningAlgorithm()} if use_blake2b else None
+    return URLSafeTimedSerializer(secret_key, salt=_SESSION_SALT, signer_kwargs=signer_kwargs)
+
+
 def _get_serializer() -> URLSafeTimedSerializer:
-    return URLSafeTimedSerializer(settings.required_secret_key, salt=_SESSION_SALT)
+    # Keyed on the secret and algorithm, so changed settings get a fresh serializer.
+    return _serializer_for(settings.required_secret_key, settings.session_token_blake2b)
 
 
 def create_session_token(user_id: int, role: str) -> str:
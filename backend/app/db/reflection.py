@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection, Inspector
+
+
+_INSPECTOR_KEY = "capa_migration_inspector"
+
+
+def get_inspector(bind: Connection) -> Inspector:
+    """Return the Inspector shared by all reflection calls on this connection.
+
+    Reusing one Inspector keeps its info_cache, so repeated has_table/get_columns
+    lookups within a migration do not re-issue PRAGMA/information_schema queries.
+    """
+    inspector = bind.info.get(_INSPECTOR_KEY)
+    if inspector is None:
+        inspector = inspect(bind)
+        bind.info[_INSPECTOR_KEY] = inspector
+    return inspector
+
+
+def reset_inspector(bind: Connection) -> None:
+    """Drop the cached Inspector after the schema has changed."""
+    bind.info.pop(_INSPECTOR_KEY, None)
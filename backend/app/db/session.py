@@ -1,17 +1,49 @@
 from __future__ import annotations
 
-from sqlalchemy import create_engine
+from contextlib import ExitStack
+
+from sqlalchemy import Engine, create_engine, event, text
 from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
 
 
+# WAL lets readers run alongside a writer, and with synchronous=NORMAL commits no longer fsync
+# the main database file. Negative cache_size values are KiB.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-64000",
+)
+
+
+def _apply_sqlite_pragmas(dbapi_connection, _connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
 def get_engine():
     database_url = settings.sqlalchemy_database_uri
-    return create_engine(
-        database_url,
-        connect_args={"check_same_thread": False} if database_url.startswith("sqlite") else {},
-    )
+    if not database_url.startswith("sqlite"):
+        return create_engine(database_url, pool_pre_ping=True, pool_size=10, max_overflow=20)
+    # check_same_thread=False because pooled connections are handed to FastAPI's worker threads.
+    engine = create_engine(database_url, connect_args={"check_same_thread": False})
+    event.listen(engine, "connect", _apply_sqlite_pragmas)
+    return engine
+
+
+def warm_pool(engine: Engine, size: int | None = None) -> None:
+    # Connections are held together so each one is opened (and gets its pragmas) before any is returned.
+    size = size if size is not None else getattr(engine.pool, "size", lambda: 1)()
+    with ExitStack() as stack:
+        for _ in range(size):
+            stack.enter_context(engine.connect()).execute(text("SELECT 1"))
 
 
 engine = get_engine()
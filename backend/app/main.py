@@ -1,23 +1,31 @@
 from __future__ import annotations
 
+import asyncio
 import importlib.util
 import logging
 import os
 import sys
 import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
-from fastapi import Depends, FastAPI, Request
-from fastapi.responses import HTMLResponse, RedirectResponse
+import anyio.to_thread
+from fastapi import BackgroundTasks, Depends, FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import HTMLResponse, JSONResponse, ORJSONResponse, RedirectResponse, Response
 from fastapi.staticfiles import StaticFiles
 from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.api import actions, analyses, kpi, projects, tags
-from app.core.auth import get_current_user_optional, require_auth
+from app.core.auth import UILoginRequired, get_ui_user, require_auth, require_ui_user
 from app.core.config import settings
 from app.core.security import hash_password, is_password_too_long
-from app.db.session import SessionLocal, engine
+from app.db.session import SessionLocal, engine, warm_pool
 from app.models.user import User
 from app.repositories import users as users_repo
 from app.services import settings as settings_service
@@ -25,9 +33,20 @@ from app.ui import routes as ui_routes
 from app.ui import routes_analyses, routes_auth, routes_champions, routes_metrics, routes_projects, routes_settings
 
 
-REQUIRED_CHAMPION_COLUMNS = {"first_name", "last_name", "email", "position", "birth_date"}
-REQUIRED_USERS_COLUMNS = {"username", "password_hash", "role", "is_active", "email"}
-REQUIRED_ACTION_COLUMNS = {"updated_at", "process_type"}
+REQUIRED_CHAMPION_COLUMNS = frozenset({"first_name", "last_name", "email", "position", "birth_date"})
+REQUIRED_USERS_COLUMNS = frozenset({"username", "password_hash", "role", "is_active", "email"})
+REQUIRED_ACTION_COLUMNS = frozenset({"updated_at", "process_type"})
+REQUIRED_COLUMNS_BY_TABLE = {
+    "champions": REQUIRED_CHAMPION_COLUMNS,
+    "users": REQUIRED_USERS_COLUMNS,
+    "actions": REQUIRED_ACTION_COLUMNS,
+}
+# orjson is optional; without it API responses fall back to the stdlib encoder.
+DEFAULT_RESPONSE_CLASS = ORJSONResponse if importlib.util.find_spec("orjson") else JSONResponse
+APP_DIR = Path(__file__).resolve().parent
+STATIC_DIR = APP_DIR / "static"
+TEMPLATES_DIR = APP_DIR / "templates"
+ALEMBIC_VERSIONS_DIR = APP_DIR.parents[1] / "alembic" / "versions"
 
 
 logger = logging.getLogger("app.request")
@@ -54,7 +73,18 @@ class BlockedModeState:
     missing_by_table: dict[str, list[str]]
 
 
-ALLOWED_WHEN_BLOCKED = {"/blocked", "/health", "/docs", "/openapi.json"}
+# Probes hit /health constantly, so one response object is reused. FastAPI only attaches the
+# request's background tasks to a returned response whose background is None; presetting an
+# empty one keeps the shared instance from being modified.
+HEALTH_OK_RESPONSE = Response(
+    content=b'{"status":"ok"}',
+    media_type="application/json",
+    background=BackgroundTasks(),
+)
+ALLOWED_WHEN_BLOCKED = frozenset({"/blocked", "/health", "/docs", "/openapi.json"})
+# Liveness probes and the blocked page skip the access log; every other middleware passes them
+# through after a single path check.
+UNLOGGED_PATHS = frozenset({"/health", "/blocked"})
 
 
 def configure_app_logging() -> None:
@@ -62,33 +92,42 @@ def configure_app_logging() -> None:
     log_level = getattr(logging, log_level_name, logging.INFO)
     logger.setLevel(log_level)
 
-    if not any(isinstance(handler, logging.StreamHandler) and handler.stream is sys.stdout for handler in logger.handlers):
-        stream_handler = logging.StreamHandler(sys.stdout)
-        stream_handler.setFormatter(
-            logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s")
-        )
-        logger.addHandler(stream_handler)
+    # create_app runs once per test; the marker replaces rescanning the handlers each time.
+    if not getattr(logger, "_capa_configured", False):
+        if not any(
+            isinstance(handler, logging.StreamHandler) and handler.stream is sys.stdout for handler in logger.handlers
+        ):
+            stream_handler = logging.StreamHandler(sys.stdout)
+            stream_handler.setFormatter(
+                logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s")
+            )
+            logger.addHandler(stream_handler)
+        logger._capa_configured = True
 
     logger.propagate = True
 
 
-def _get_alembic_revisions(engine) -> list[str]:
-    inspector = inspect(engine)
-    if not inspector.has_table("alembic_version"):
+def _get_alembic_revisions(connection: Connection, table_names: set[str]) -> list[str]:
+    if "alembic_version" not in table_names:
         return []
-    with engine.connect() as connection:
-        rows = connection.execute(text("SELECT version_num FROM alembic_version")).fetchall()
+    rows = connection.execute(text("SELECT version_num FROM alembic_version")).fetchall()
     return [str(row[0]) for row in rows]
 
 
-def _get_expected_alembic_revisions() -> list[str]:
-    versions_dir = Path(__file__).resolve().parents[2] / "alembic" / "versions"
-    revisions: list[str] = []
-    for migration_file in versions_dir.glob("*.py"):
-        revision = migration_file.stem.split("_", maxsplit=1)[0]
-        if revision:
-            revisions.append(revision)
-    return sorted(set(revisions))
+@lru_cache(maxsize=1)
+def _get_expected_alembic_revisions() -> frozenset[str]:
+    # Migration files do not change while the process runs, so the directory is scanned once.
+    try:
+        with os.scandir(ALEMBIC_VERSIONS_DIR) as entries:
+            revisions = {
+                entry.name[:-3].split("_", maxsplit=1)[0]
+                for entry in entries
+                if entry.name.endswith(".py") and entry.is_file(follow_symlinks=False)
+            }
+    except FileNotFoundError:
+        return frozenset()
+    revisions.discard("")
+    return frozenset(revisions)
 
 
 def _build_schema_error_message(result: SchemaValidationResult) -> str:
@@ -170,30 +209,25 @@ def _log_settings_ui_module_path() -> None:
 
 
 def validate_dev_schema(engine) -> SchemaValidationResult:
-    inspector = inspect(engine)
     db_uri = settings.sqlalchemy_database_uri
     missing_by_table: dict[str, list[str]] = {}
     expected_revisions = _get_expected_alembic_revisions()
-    detected_revisions = _get_alembic_revisions(engine)
-    missing_revisions = sorted(set(expected_revisions) - set(detected_revisions))
-
-    if inspector.has_table("champions"):
-        champion_columns = {column["name"] for column in inspector.get_columns("champions")}
-        missing_champions = sorted(REQUIRED_CHAMPION_COLUMNS - champion_columns)
-        if missing_champions:
-            missing_by_table["champions"] = missing_champions
-
-    if inspector.has_table("users"):
-        users_columns = {column["name"] for column in inspector.get_columns("users")}
-        missing_users = sorted(REQUIRED_USERS_COLUMNS - users_columns)
-        if missing_users:
-            missing_by_table["users"] = missing_users
-
-    if inspector.has_table("actions"):
-        action_columns = {column["name"] for column in inspector.get_columns("actions")}
-        missing_actions = sorted(REQUIRED_ACTION_COLUMNS - action_columns)
-        if missing_actions:
-            missing_by_table["actions"] = missing_actions
+    # Everything runs on this one connection: the Inspector is bound to it, and the columns of all
+    # checked tables are reflected in a single call.
+    with engine.connect() as connection:
+        inspector = inspect(connection)
+        table_names = set(inspector.get_table_names())
+        detected_revisions = _get_alembic_revisions(connection, table_names)
+        checked_tables = [table_name for table_name in REQUIRED_COLUMNS_BY_TABLE if table_name in table_names]
+        columns_by_table = (
+            inspector.get_multi_columns(filter_names=checked_tables) if checked_tables else {}
+        )
+    missing_revisions = sorted(expected_revisions.difference(detected_revisions))
+
+    for table_name in checked_tables:
+        columns = {column["name"] for column in columns_by_table.get((None, table_name), ())}
+        if missing_columns := REQUIRED_COLUMNS_BY_TABLE[table_name] - columns:
+            missing_by_table[table_name] = sorted(missing_columns)
 
     result = SchemaValidationResult(
         is_valid=not (missing_revisions or missing_by_table),
@@ -212,10 +246,97 @@ def validate_dev_schema(engine) -> SchemaValidationResult:
     raise RuntimeError(error_message)
 
 
-def create_app() -> FastAPI:
+class SchemaBlockMiddleware:
+    # Plain ASGI rather than @app.middleware("http"): the common not-blocked case is a flag check
+    # on the scope, with no Request object or BaseHTTPMiddleware task per request.
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            blocked_state: BlockedModeState | None = scope["app"].state.blocked_mode
+            if blocked_state is not None and blocked_state.is_blocked and scope["path"] not in ALLOWED_WHEN_BLOCKED:
+                await RedirectResponse(url="/blocked", status_code=307)(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+class UIExceptionMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith("/ui"):
+            await self.app(scope, receive, send)
+            return
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            # Once headers are out the error page can no longer replace the response.
+            if response_started:
+                raise
+            logger.exception("Unhandled UI exception for %s", scope["path"])
+            response = HTMLResponse(
+                content=(
+                    "<!doctype html><html lang='en'><head><meta charset='utf-8'>"
+                    "<title>CAPA UI Error</title></head><body>"
+                    "<h1>CAPA UI Error</h1>"
+                    "<p>The page could not be rendered due to an internal error.</p>"
+                    f"<p><strong>{type(exc).__name__}:</strong> {exc}</p>"
+                    "<p><a href='/login'>Go to Login</a></p>"
+                    "</body></html>"
+                ),
+                status_code=500,
+            )
+            await response(scope, receive, send)
+
+
+class RequestLoggingMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in UNLOGGED_PATHS:
+            await self.app(scope, receive, send)
+            return
+        started_at = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            # Checked first so nothing is timed or formatted when LOG_LEVEL is above INFO.
+            if message["type"] == "http.response.start" and logger.isEnabledFor(logging.INFO):
+                elapsed_ms = (time.perf_counter() - started_at) * 1000
+                logger.info("%s %s -> %s (%.2f ms)", scope["method"], scope["path"], message["status"], elapsed_ms)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            elapsed_ms = (time.perf_counter() - started_at) * 1000
+            logger.exception("%s %s -> 500 (%.2f ms)", scope["method"], scope["path"], elapsed_ms)
+            raise
+
+
+def create_app(*, initialize_database: bool = False) -> FastAPI:
     configure_app_logging()
     if settings.auth_enabled:
         settings.required_secret_key
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        # Sync endpoints and their DB sessions run on AnyIO's worker threads; size the pool per deployment.
+        anyio.to_thread.current_default_thread_limiter().total_tokens = settings.worker_threads
+        if initialize_database:
+            await _initialize_database(app)
+        yield
+
     docs_url = "/docs" if settings.dev_mode else None
     openapi_url = "/openapi.json" if settings.dev_mode else None
     redoc_url = "/redoc" if settings.dev_mode else None
@@ -225,6 +346,8 @@ def create_app() -> FastAPI:
         docs_url=docs_url,
         openapi_url=openapi_url,
         redoc_url=redoc_url,
+        default_response_class=DEFAULT_RESPONSE_CLASS,
+        lifespan=lifespan,
         swagger_ui_parameters={
             "tryItOutEnabled": True,
             "supportedSubmitMethods": ["get", "post", "put", "patch", "delete"],
@@ -233,126 +356,72 @@ def create_app() -> FastAPI:
         },
     )
 
-    app.state.blocked_mode = BlockedModeState(
-        is_blocked=False,
-        database_url=settings.sqlalchemy_database_uri,
-        missing_revisions=[],
-        missing_by_table={},
-    )
+    # Built once by the lifespan from the schema check; None until then reads as not blocked.
+    app.state.blocked_mode = None
+
+    app.add_middleware(SchemaBlockMiddleware)
+
+    # Without auth the router-level check is a no-op, so leave it out of the dependency graph.
+    auth_dependencies = [Depends(require_auth)] if settings.auth_enabled else []
+    app.include_router(actions.router, dependencies=auth_dependencies)
+    app.include_router(projects.router, dependencies=auth_dependencies)
+    app.include_router(kpi.router, dependencies=auth_dependencies)
+    app.include_router(tags.router, dependencies=auth_dependencies)
+    app.include_router(analyses.router, dependencies=auth_dependencies)
+    # Login and signup only need to know who is signed in; every other UI page requires a user.
+    app.include_router(routes_auth.router, dependencies=[Depends(get_ui_user)])
+    ui_dependencies = [Depends(require_ui_user)]
+    app.include_router(ui_routes.router, dependencies=ui_dependencies)
+    app.include_router(routes_projects.router, dependencies=ui_dependencies)
+    app.include_router(routes_champions.router, dependencies=ui_dependencies)
+    app.include_router(routes_metrics.router, dependencies=ui_dependencies)
+    app.include_router(routes_settings.router, dependencies=ui_dependencies)
+    app.include_router(routes_analyses.router, dependencies=ui_dependencies)
+
+    @app.exception_handler(UILoginRequired)
+    async def ui_login_required(request: Request, _exc: UILoginRequired):
+        if request.headers.get("HX-Request"):
+            response = HTMLResponse("Login required", status_code=401)
+            response.headers["HX-Redirect"] = "/login"
+            return response
+        return RedirectResponse("/login", status_code=302)
 
-    @app.middleware("http")
-    async def schema_block_middleware(request: Request, call_next):
-        blocked_state: BlockedModeState = app.state.blocked_mode
-        if not blocked_state.is_blocked:
-            return await call_next(request)
-        if request.url.path in ALLOWED_WHEN_BLOCKED:
-            return await call_next(request)
-        return RedirectResponse(url="/blocked", status_code=307)
-
-    app.include_router(actions.router, dependencies=[Depends(require_auth)])
-    app.include_router(projects.router, dependencies=[Depends(require_auth)])
-    app.include_router(kpi.router, dependencies=[Depends(require_auth)])
-    app.include_router(tags.router, dependencies=[Depends(require_auth)])
-    app.include_router(analyses.router, dependencies=[Depends(require_auth)])
-    app.include_router(routes_auth.router)
-    app.include_router(ui_routes.router)
-    app.include_router(routes_projects.router)
-    app.include_router(routes_champions.router)
-    app.include_router(routes_metrics.router)
-    app.include_router(routes_settings.router)
-    app.include_router(routes_analyses.router)
-
-    static_dir = Path(__file__).resolve().parent / "static"
-    templates_dir = Path(__file__).resolve().parent / "templates"
-    app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
-    app.mount("/templates", StaticFiles(directory=str(templates_dir)), name="templates")
+    app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
+    app.mount("/templates", StaticFiles(directory=str(TEMPLATES_DIR)), name="templates")
 
     @app.get("/login", include_in_schema=False)
     def login_redirect() -> RedirectResponse:
         return RedirectResponse(url="/ui/login", status_code=302)
 
-    @app.get("/health")
-    def healthcheck() -> dict[str, str]:
-        blocked_state: BlockedModeState = app.state.blocked_mode
-        if blocked_state.is_blocked:
+    @app.get("/health", response_model=dict[str, str])
+    def healthcheck():
+        blocked_state: BlockedModeState | None = app.state.blocked_mode
+        if blocked_state is not None and blocked_state.is_blocked:
             return {
                 "status": "blocked",
                 "reason": "pending migrations",
                 "action_required": "alembic upgrade head",
             }
-        return {"status": "ok"}
+        return HEALTH_OK_RESPONSE
 
     @app.get("/blocked", response_class=HTMLResponse, include_in_schema=False)
     def blocked_page() -> HTMLResponse:
-        blocked_state: BlockedModeState = app.state.blocked_mode
-        return HTMLResponse(content=_build_blocked_mode_html(blocked_state), status_code=200)
-
-    @app.middleware("http")
-    async def ui_auth_middleware(request: Request, call_next):
-        request.state.user = None
-        if settings.auth_enabled and request.url.path.startswith("/ui"):
-            try:
-                with SessionLocal() as db:
-                    request.state.user = get_current_user_optional(request, db)
-            except Exception:
-                logger.exception("Failed to resolve UI session for %s", request.url.path)
-                request.state.user = None
-            if (
-                not request.url.path.startswith("/ui/login")
-                and not request.url.path.startswith("/ui/signup")
-                and not request.state.user
-            ):
-                if request.headers.get("HX-Request"):
-                    response = HTMLResponse("Login required", status_code=401)
-                    response.headers["HX-Redirect"] = "/login"
-                    return response
-                return RedirectResponse("/login", status_code=302)
-        return await call_next(request)
-
-    @app.middleware("http")
-    async def ui_exception_middleware(request: Request, call_next):
-        if not request.url.path.startswith("/ui"):
-            return await call_next(request)
-        try:
-            return await call_next(request)
-        except Exception as exc:
-            logger.exception("Unhandled UI exception for %s", request.url.path)
-            return HTMLResponse(
-                content=(
-                    "<!doctype html><html lang='en'><head><meta charset='utf-8'>"
-                    "<title>CAPA UI Error</title></head><body>"
-                    "<h1>CAPA UI Error</h1>"
-                    "<p>The page could not be rendered due to an internal error.</p>"
-                    f"<p><strong>{type(exc).__name__}:</strong> {exc}</p>"
-                    "<p><a href='/login'>Go to Login</a></p>"
-                    "</body></html>"
-                ),
-                status_code=500,
+        blocked_state: BlockedModeState | None = app.state.blocked_mode
+        # Rendered once per blocked state; the state is replaced, never mutated, when it changes.
+        cached = getattr(app.state, "blocked_page", None)
+        if cached is None or cached[0] is not blocked_state:
+            page_state = blocked_state or BlockedModeState(
+                is_blocked=False,
+                database_url=settings.sqlalchemy_database_uri,
+                missing_revisions=[],
+                missing_by_table={},
             )
+            cached = (blocked_state, _build_blocked_mode_html(page_state).encode("utf-8"))
+            app.state.blocked_page = cached
+        return HTMLResponse(content=cached[1], status_code=200)
 
-    @app.middleware("http")
-    async def request_logging_middleware(request: Request, call_next):
-        started_at = time.perf_counter()
-        try:
-            response = await call_next(request)
-            elapsed_ms = (time.perf_counter() - started_at) * 1000
-            logger.info(
-                "%s %s -> %s (%.2f ms)",
-                request.method,
-                request.url.path,
-                response.status_code,
-                elapsed_ms,
-            )
-            return response
-        except Exception:
-            elapsed_ms = (time.perf_counter() - started_at) * 1000
-            logger.exception(
-                "%s %s -> 500 (%.2f ms)",
-                request.method,
-                request.url.path,
-                elapsed_ms,
-            )
-            raise
+    app.add_middleware(UIExceptionMiddleware)
+    app.add_middleware(RequestLoggingMiddleware)
 
     return app
 
@@ -398,20 +467,7 @@ def seed_admin_user(db: SessionLocal) -> None:
         raise RuntimeError(f"Failed to seed admin user: {exc}") from exc
 
 
-app = create_app()
-
-
-@app.on_event("startup")
-def on_startup() -> None:
-    if settings.dev_mode:
-        _log_settings_ui_module_path()
-    schema_status = validate_dev_schema(engine)
-    app.state.blocked_mode = BlockedModeState(
-        is_blocked=settings.dev_mode and not schema_status.is_valid,
-        database_url=schema_status.database_url,
-        missing_revisions=schema_status.missing_revisions,
-        missing_by_table=schema_status.missing_by_table,
-    )
+def _seed_startup_rows() -> None:
     if settings.auth_enabled:
         db = SessionLocal()
         try:
@@ -424,3 +480,23 @@ def on_startup() -> None:
         settings_service.ensure_labour_cost_rows(db)
     finally:
         db.close()
+
+
+async def _initialize_database(app: FastAPI) -> None:
+    if settings.dev_mode:
+        _log_settings_ui_module_path()
+    # Both only read, so the schema check and the pool warm-up overlap.
+    schema_status, _ = await asyncio.gather(
+        run_in_threadpool(validate_dev_schema, engine),
+        run_in_threadpool(warm_pool, engine),
+    )
+    app.state.blocked_mode = BlockedModeState(
+        is_blocked=settings.dev_mode and not schema_status.is_valid,
+        database_url=schema_status.database_url,
+        missing_revisions=schema_status.missing_revisions,
+        missing_by_table=schema_status.missing_by_table,
+    )
+    await run_in_threadpool(_seed_startup_rows)
+
+
+app = create_app(initialize_database=True)
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 from datetime import date
+from functools import lru_cache
 from typing import Iterable
 
-from sqlalchemy import Date, case, func, select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import Date, Integer, case, cast, delete, func, insert, select
+from sqlalchemy.orm import joinedload, load_only, selectinload
 from sqlalchemy.orm import Session
 
 from app.models.action import Action
@@ -14,7 +15,7 @@ from app.models.moulding import MouldingTool
 from app.models.champion import Champion
 from app.models.project import Project
 from app.models.subtask import Subtask
-from app.models.tag import Tag
+from app.models.tag import Tag, action_tags
 
 
 DEFAULT_SORT = "created_at_desc"
@@ -28,6 +29,7 @@ ALLOWED_SORTS = {
 }
 
 
+@lru_cache(maxsize=64)
 def normalize_sort(sort: str | None) -> str:
     if sort in ALLOWED_SORTS:
         return sort
@@ -44,8 +46,25 @@ def _days_late_expr():
     )
 
 
-def list_actions(
-    db: Session,
+def _delay_days_expr(due_date, closed_at, today: date):
+    # Mirrors services.metrics._calculate_delay on whole dates, so julianday differences are exact.
+    end_date = func.coalesce(func.date(closed_at), today.isoformat())
+    return case(
+        (due_date.is_(None), 0),
+        else_=func.max(cast(func.julianday(end_date) - func.julianday(func.date(due_date)), Integer), 0),
+    )
+
+
+def _time_to_close_days_expr(closed_at, created_at):
+    # Whole days like timedelta.days: the date difference, less one when the close time of day
+    # is earlier than the creation time of day.
+    date_days = func.julianday(func.date(closed_at)) - func.julianday(func.date(created_at))
+    earlier_time = case((func.strftime("%H:%M:%f", closed_at) < func.strftime("%H:%M:%f", created_at), 1), else_=0)
+    return cast(date_days, Integer) - earlier_time
+
+
+def _apply_filters(
+    stmt,
     statuses: list[str] | None = None,
     champion_id: int | None = None,
     champion_name: str | None = None,
@@ -57,27 +76,14 @@ def list_actions(
     tags: list[str] | None = None,
     due_from: date | None = None,
     due_to: date | None = None,
-    sort: str | None = None,
-    limit: int = 100,
-    offset: int = 0,
-) -> tuple[list[Action], int]:
-    stmt = select(Action).options(
-        selectinload(Action.project),
-        selectinload(Action.champion),
-        selectinload(Action.tags),
-        selectinload(Action.moulding_tools),
-        selectinload(Action.metalization_masks),
-        selectinload(Action.assembly_references),
-        selectinload(Action.analyses),
-    )
-
+):
     if statuses:
         stmt = stmt.where(Action.status.in_(statuses))
     if champion_id is not None:
         stmt = stmt.where(Action.champion_id == champion_id)
     if champion_name:
         champion_full_name = func.lower(func.trim(Champion.first_name + " " + Champion.last_name))
-        stmt = stmt.join(Champion, isouter=True).where(
+        stmt = stmt.join(Champion, Action.champion, isouter=True).where(
             (champion_full_name == champion_name.lower())
             | (func.lower(Action.owner) == champion_name.lower())
         )
@@ -88,7 +94,7 @@ def list_actions(
     elif unassigned:
         stmt = stmt.where(Action.project_id.is_(None))
     if project_name:
-        stmt = stmt.join(Project, isouter=True).where(func.lower(Project.name) == project_name.lower())
+        stmt = stmt.join(Project, Action.project, isouter=True).where(func.lower(Project.name) == project_name.lower())
     if query:
         like_query = f"%{query.lower()}%"
         stmt = stmt.where(
@@ -101,30 +107,145 @@ def list_actions(
         stmt = stmt.where(Action.due_date >= due_from)
     if due_to:
         stmt = stmt.where(Action.due_date <= due_to)
+    return stmt
 
-    total = db.scalar(select(func.count()).select_from(stmt.subquery())) or 0
 
+def _apply_sort(stmt, sort: str | None):
     normalized_sort = normalize_sort(sort)
     due_date_nulls_last = case((Action.due_date.is_(None), 1), else_=0)
 
     if normalized_sort == "created_at_asc":
-        stmt = stmt.order_by(Action.created_at.asc(), Action.id.asc())
-    elif normalized_sort == "due_date_asc":
-        stmt = stmt.order_by(due_date_nulls_last.asc(), Action.due_date.asc(), Action.id.desc())
-    elif normalized_sort == "due_date_desc":
-        stmt = stmt.order_by(due_date_nulls_last.asc(), Action.due_date.desc(), Action.id.desc())
-    elif normalized_sort == "days_late_desc":
-        stmt = stmt.order_by(_days_late_expr().desc(), Action.id.desc())
-    elif normalized_sort == "title_asc":
-        stmt = stmt.order_by(func.lower(Action.title).asc(), Action.id.asc())
-    else:
-        stmt = stmt.order_by(Action.created_at.desc(), Action.id.desc())
+        return stmt.order_by(Action.created_at.asc(), Action.id.asc())
+    if normalized_sort == "due_date_asc":
+        return stmt.order_by(due_date_nulls_last.asc(), Action.due_date.asc(), Action.id.desc())
+    if normalized_sort == "due_date_desc":
+        return stmt.order_by(due_date_nulls_last.asc(), Action.due_date.desc(), Action.id.desc())
+    if normalized_sort == "days_late_desc":
+        return stmt.order_by(_days_late_expr().desc(), Action.id.desc())
+    if normalized_sort == "title_asc":
+        return stmt.order_by(func.lower(Action.title).asc(), Action.id.asc())
+    return stmt.order_by(Action.created_at.desc(), Action.id.desc())
+
+
+def list_actions(
+    db: Session,
+    statuses: list[str] | None = None,
+    champion_id: int | None = None,
+    champion_name: str | None = None,
+    owner: str | None = None,
+    project_id: int | None = None,
+    project_name: str | None = None,
+    query: str | None = None,
+    unassigned: bool = False,
+    tags: list[str] | None = None,
+    due_from: date | None = None,
+    due_to: date | None = None,
+    sort: str | None = None,
+    limit: int = 100,
+    offset: int = 0,
+) -> tuple[list[Action], int]:
+    # Many-to-one parents ride along on the main query, narrowed to the name columns list rows show;
+    # collections are batched with selectin.
+    stmt = select(Action).options(
+        joinedload(Action.project).load_only(Project.id, Project.name),
+        joinedload(Action.champion).load_only(Champion.id, Champion.first_name, Champion.last_name),
+        selectinload(Action.tags),
+        selectinload(Action.moulding_tools),
+        selectinload(Action.metalization_masks),
+        selectinload(Action.assembly_references),
+        selectinload(Action.analyses),
+    )
+    stmt = _apply_filters(
+        stmt,
+        statuses=statuses,
+        champion_id=champion_id,
+        champion_name=champion_name,
+        owner=owner,
+        project_id=project_id,
+        project_name=project_name,
+        query=query,
+        unassigned=unassigned,
+        tags=tags,
+        due_from=due_from,
+        due_to=due_to,
+    )
 
-    stmt = stmt.limit(limit).offset(offset)
+    total = db.scalar(select(func.count()).select_from(stmt.subquery())) or 0
+
+    stmt = _apply_sort(stmt, sort).limit(limit).offset(offset)
 
     return list(db.scalars(stmt).all()), total
 
 
+def aggregate_kpi(
+    db: Session,
+    statuses: list[str] | None = None,
+    champion_id: int | None = None,
+    champion_name: str | None = None,
+    owner: str | None = None,
+    project_id: int | None = None,
+    project_name: str | None = None,
+    query: str | None = None,
+    unassigned: bool = False,
+    tags: list[str] | None = None,
+    due_from: date | None = None,
+    due_to: date | None = None,
+    sort: str | None = None,
+    limit: int = 1000,
+    offset: int = 0,
+    today: date | None = None,
+) -> dict[str, float | int]:
+    # Same figures as services.kpi.build_actions_kpi, computed over the same page of actions.
+    today = today or date.today()
+    page = _apply_filters(
+        select(Action.id, Action.status, Action.due_date, Action.closed_at, Action.created_at),
+        statuses=statuses,
+        champion_id=champion_id,
+        champion_name=champion_name,
+        owner=owner,
+        project_id=project_id,
+        project_name=project_name,
+        query=query,
+        unassigned=unassigned,
+        tags=tags,
+        due_from=due_from,
+        due_to=due_to,
+    )
+    page = _apply_sort(page, sort).limit(limit).offset(offset).subquery()
+    subtask_delays = (
+        select(
+            Subtask.action_id.label("action_id"),
+            func.sum(_delay_days_expr(Subtask.due_date, Subtask.closed_at, today)).label("days_late"),
+        )
+        .where(Subtask.action_id.in_(select(page.c.id)))
+        .group_by(Subtask.action_id)
+        .subquery()
+    )
+
+    is_open = func.lower(page.c.status) != "closed"
+    is_closed = page.c.closed_at.is_not(None)
+    stmt = select(
+        func.count(case((is_open, 1))),
+        func.count(case((is_open & (page.c.due_date < today), 1))),
+        func.count(case((is_closed, 1))),
+        func.count(case((is_closed & (func.date(page.c.closed_at) <= page.c.due_date), 1))),
+        func.avg(case((is_closed, _time_to_close_days_expr(page.c.closed_at, page.c.created_at)))),
+        func.sum(
+            func.coalesce(subtask_delays.c.days_late, _delay_days_expr(page.c.due_date, page.c.closed_at, today))
+        ),
+    ).outerjoin(subtask_delays, subtask_delays.c.action_id == page.c.id)
+    open_count, overdue_count, closed_count, on_time_count, avg_ttc, sum_days_late = db.execute(stmt).one()
+
+    on_time_rate = on_time_count / closed_count * 100 if closed_count else 0.0
+    return {
+        "open_count": open_count,
+        "overdue_count": overdue_count,
+        "on_time_close_rate": round(on_time_rate, 2),
+        "avg_time_to_close_days": round(avg_ttc or 0.0, 2),
+        "sum_days_late": int(sum_days_late or 0),
+    }
+
+
 def list_actions_for_projects(db: Session, project_ids: list[int]) -> list[Action]:
     if not project_ids:
         return []
@@ -137,6 +258,7 @@ def list_actions_for_projects(db: Session, project_ids: list[int]) -> list[Actio
             selectinload(Action.moulding_tools),
             selectinload(Action.metalization_masks),
             selectinload(Action.assembly_references),
+            selectinload(Action.subtasks),
         )
         .where(Action.project_id.in_(project_ids))
     )
@@ -149,16 +271,31 @@ def list_actions_created_between(
     date_to: date | None,
     project_id: int | None = None,
     champion_id: int | None = None,
+    kpi_only: bool = False,
 ) -> list[Action]:
-    stmt = select(Action).options(
-        selectinload(Action.project),
-        selectinload(Action.champion),
-        selectinload(Action.tags),
-        selectinload(Action.moulding_tools),
-        selectinload(Action.metalization_masks),
-        selectinload(Action.assembly_references),
-        selectinload(Action.analyses),
-    )
+    if kpi_only:
+        # KPI rows only read these columns, so skip description and the eager relationship loads.
+        stmt = select(Action).options(
+            load_only(
+                Action.id,
+                Action.status,
+                Action.due_date,
+                Action.closed_at,
+                Action.created_at,
+                Action.champion_id,
+                Action.project_id,
+            )
+        )
+    else:
+        stmt = select(Action).options(
+            selectinload(Action.project),
+            selectinload(Action.champion),
+            selectinload(Action.tags),
+            selectinload(Action.moulding_tools),
+            selectinload(Action.metalization_masks),
+            selectinload(Action.assembly_references),
+            selectinload(Action.analyses),
+        )
     created_date = func.date(Action.created_at).cast(Date)
     if date_from:
         stmt = stmt.where(created_date >= date_from)
@@ -174,8 +311,8 @@ def list_actions_created_between(
 
 def get_action(db: Session, action_id: int) -> Action | None:
     stmt = select(Action).options(
-        selectinload(Action.project),
-        selectinload(Action.champion),
+        joinedload(Action.project),
+        joinedload(Action.champion),
         selectinload(Action.tags),
         selectinload(Action.moulding_tools),
         selectinload(Action.metalization_masks),
@@ -189,8 +326,8 @@ def list_actions_by_project(db: Session, project_id: int) -> list[Action]:
     stmt = (
         select(Action)
         .options(
-            selectinload(Action.project),
-            selectinload(Action.champion),
+            joinedload(Action.project),
+            joinedload(Action.champion),
             selectinload(Action.tags),
             selectinload(Action.moulding_tools),
             selectinload(Action.metalization_masks),
@@ -221,18 +358,63 @@ def delete_action(db: Session, action: Action) -> None:
     db.commit()
 
 
+def action_exists(db: Session, action_id: int) -> bool:
+    return db.scalar(select(Action.id).where(Action.id == action_id)) is not None
+
+
+def add_action_tag(db: Session, action_id: int, tag_id: int) -> None:
+    # Works on the link table directly so the action's tags collection is never loaded.
+    linked = select(action_tags.c.action_id).where(
+        action_tags.c.action_id == action_id, action_tags.c.tag_id == tag_id
+    )
+    if db.scalar(linked) is None:
+        db.execute(insert(action_tags).values(action_id=action_id, tag_id=tag_id))
+    db.commit()
+
+
+def remove_action_tag(db: Session, action_id: int, tag_id: int) -> None:
+    db.execute(delete(action_tags).where(action_tags.c.action_id == action_id, action_tags.c.tag_id == tag_id))
+    db.commit()
+
+
 def list_subtasks(db: Session, action_id: int) -> list[Subtask]:
     stmt = select(Subtask).where(Subtask.action_id == action_id).order_by(Subtask.id.asc())
     return list(db.scalars(stmt).all())
 
 
 def list_subtasks_for_actions(db: Session, action_ids: Iterable[int]) -> list[Subtask]:
+    action_ids = list(action_ids)
     if not action_ids:
         return []
-    stmt = select(Subtask).where(Subtask.action_id.in_(list(action_ids)))
+    stmt = select(Subtask).where(Subtask.action_id.in_(action_ids)).order_by(Subtask.action_id, Subtask.id)
     return list(db.scalars(stmt).all())
 
 
+def days_late_by_action(db: Session, action_ids: Iterable[int], today: date | None = None) -> dict[int, int]:
+    action_ids = list(action_ids)
+    if not action_ids:
+        return {}
+    today = today or date.today()
+    subtask_delays = (
+        select(
+            Subtask.action_id.label("action_id"),
+            func.sum(_delay_days_expr(Subtask.due_date, Subtask.closed_at, today)).label("days_late"),
+        )
+        .where(Subtask.action_id.in_(action_ids))
+        .group_by(Subtask.action_id)
+        .subquery()
+    )
+    stmt = (
+        select(
+            Action.id,
+            func.coalesce(subtask_delays.c.days_late, _delay_days_expr(Action.due_date, Action.closed_at, today)),
+        )
+        .outerjoin(subtask_delays, subtask_delays.c.action_id == Action.id)
+        .where(Action.id.in_(action_ids))
+    )
+    return {action_id: int(days_late) for action_id, days_late in db.execute(stmt)}
+
+
 def create_subtask(db: Session, subtask: Subtask) -> Subtask:
     db.add(subtask)
     db.commit()
@@ -244,6 +426,11 @@ def get_subtask(db: Session, subtask_id: int) -> Subtask | None:
     return db.get(Subtask, subtask_id)
 
 
+def get_subtask_with_action(db: Session, subtask_id: int) -> Subtask | None:
+    stmt = select(Subtask).options(joinedload(Subtask.action)).where(Subtask.id == subtask_id)
+    return db.scalar(stmt)
+
+
 def update_subtask(db: Session, subtask: Subtask) -> Subtask:
     db.add(subtask)
     db.commit()
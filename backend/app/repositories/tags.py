@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Iterable
+
 from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
@@ -36,3 +38,22 @@ def get_or_create_tag(db: Session, name: str, color: str | None = None) -> Tag:
     if existing:
         return existing
     return create_tag(db, name=name, color=color)
+
+
+def get_or_create_tags(db: Session, names: Iterable[str]) -> list[Tag]:
+    # One lookup for all names and one flush for the missing ones; duplicates collapse to the first spelling.
+    requested: dict[str, str] = {}
+    for name in names:
+        name = name.strip()
+        if not name:
+            raise ValueError("Tag name is required")
+        requested.setdefault(name.lower(), name)
+    if not requested:
+        return []
+    found = {tag.name.lower(): tag for tag in db.scalars(select(Tag).where(func.lower(Tag.name).in_(requested)))}
+    missing = {key: Tag(name=name) for key, name in requested.items() if key not in found}
+    if missing:
+        db.add_all(missing.values())
+        db.flush()
+        found.update(missing)
+    return [found[key] for key in requested]
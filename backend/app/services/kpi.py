@@ -4,7 +4,12 @@ from datetime import date
 
 from app.models.action import Action
 from app.models.subtask import Subtask
-from app.services.metrics import calculate_action_days_late, calculate_on_time_close_rate, calculate_time_to_close_days
+from app.services.metrics import (
+    calculate_action_days_late,
+    calculate_on_time_close_rate,
+    calculate_time_to_close_days,
+    group_subtasks_by_action,
+)
 
 
 def build_actions_kpi(
@@ -13,9 +18,7 @@ def build_actions_kpi(
     today: date | None = None,
 ) -> dict[str, float | int]:
     today = today or date.today()
-    subtask_map: dict[int, list[Subtask]] = {}
-    for subtask in subtasks:
-        subtask_map.setdefault(subtask.action_id, []).append(subtask)
+    subtask_map = group_subtasks_by_action(subtasks)
 
     open_count = 0
     overdue_count = 0
@@ -27,7 +30,7 @@ def build_actions_kpi(
             open_count += 1
             if action.due_date and action.due_date < today:
                 overdue_count += 1
-        days_late = calculate_action_days_late(action, subtask_map.get(action.id, []), today=today)
+        days_late = calculate_action_days_late(action, subtask_map.get(action.id, ()), today=today)
         sum_days_late += days_late
         ttc = calculate_time_to_close_days(action)
         if ttc is not None:
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
 from datetime import date, datetime
 
@@ -14,6 +16,13 @@ class ActionMetrics:
     on_time_close: bool | None
 
 
+def group_subtasks_by_action(subtasks: Iterable[Subtask]) -> dict[int, list[Subtask]]:
+    grouped: defaultdict[int, list[Subtask]] = defaultdict(list)
+    for subtask in subtasks:
+        grouped[subtask.action_id].append(subtask)
+    return grouped
+
+
 def _coerce_date(value: date | datetime | None) -> date | None:
     if value is None:
         return None
@@ -32,7 +41,7 @@ def _calculate_delay(due_date: date | None, closed_at: date | None, today: date)
     return max(0, delta.days)
 
 
-def calculate_action_days_late(action: Action, subtasks: list[Subtask], today: date | None = None) -> int:
+def calculate_action_days_late(action: Action, subtasks: Sequence[Subtask], today: date | None = None) -> int:
     today = today or date.today()
     if subtasks:
         total = 0
@@ -72,3 +81,11 @@ def build_action_metrics(action: Action, subtasks: list[Subtask], today: date |
     time_to_close = calculate_time_to_close_days(action)
     on_time = calculate_on_time_close(action)
     return ActionMetrics(days_late=days_late, time_to_close_days=time_to_close, on_time_close=on_time)
+
+
+def build_action_metrics_with_days_late(action: Action, days_late: int) -> ActionMetrics:
+    return ActionMetrics(
+        days_late=days_late,
+        time_to_close_days=calculate_time_to_close_days(action),
+        on_time_close=calculate_on_time_close(action),
+    )
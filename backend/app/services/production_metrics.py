@@ -5,15 +5,14 @@ from datetime import date
 from app.models.action import Action
 from app.models.subtask import Subtask
 from app.services.kpi import build_actions_kpi
+from app.services.metrics import group_subtasks_by_action
 
 
 def build_daily_kpi_rows(
     actions: list[Action],
     subtasks: list[Subtask],
 ) -> list[dict[str, object]]:
-    subtasks_by_action: dict[int, list[Subtask]] = {}
-    for subtask in subtasks:
-        subtasks_by_action.setdefault(subtask.action_id, []).append(subtask)
+    subtasks_by_action = group_subtasks_by_action(subtasks)
 
     actions_by_day: dict[date, list[Action]] = {}
     for action in actions:
@@ -24,7 +23,7 @@ def build_daily_kpi_rows(
     for day, day_actions in sorted(actions_by_day.items(), key=lambda item: item[0]):
         day_subtasks = []
         for action in day_actions:
-            day_subtasks.extend(subtasks_by_action.get(action.id, []))
+            day_subtasks.extend(subtasks_by_action.get(action.id, ()))
         kpi = build_actions_kpi(day_actions, day_subtasks, today=day)
         rows.append(
             {
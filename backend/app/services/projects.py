@@ -37,10 +37,6 @@ def list_projects_with_rollups(
 
     project_ids = [project.id for project in projects]
     actions = actions_repo.list_actions_for_projects(db, project_ids)
-    subtasks = actions_repo.list_subtasks_for_actions(db, [action.id for action in actions])
-    subtask_map: dict[int, list] = {}
-    for subtask in subtasks:
-        subtask_map.setdefault(subtask.action_id, []).append(subtask)
 
     today = date.today()
     rollups: list[ProjectRollup] = []
@@ -60,7 +56,7 @@ def list_projects_with_rollups(
                 open_count += 1
                 if action.due_date and action.due_date < today:
                     overdue_count += 1
-            sum_days_late += calculate_action_days_late(action, subtask_map.get(action.id, []), today=today)
+            sum_days_late += calculate_action_days_late(action, action.subtasks, today=today)
         rollups.append(
             ProjectRollup(
                 project=project,
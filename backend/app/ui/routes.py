@@ -445,7 +445,7 @@ def create_action(
     )
     if tags:
         parsed_tags = [item.strip() for item in tags.split(",") if item.strip()]
-        action.tags = [tags_repo.get_or_create_tag(db, tag_name) for tag_name in parsed_tags]
+        action.tags = tags_repo.get_or_create_tags(db, parsed_tags)
     _clear_non_matching_components(action)
     action = actions_repo.create_action(db, action)
     return RedirectResponse(url=f"/ui/actions/{action.id}?edit=1", status_code=303)
@@ -604,9 +604,7 @@ def add_action_tag(
     enforce_write_access(user)
     enforce_action_ownership(user, action)
     tag = tags_repo.get_or_create_tag(db, tag_name)
-    if tag not in action.tags:
-        action.tags.append(tag)
-    actions_repo.update_action(db, action)
+    actions_repo.add_action_tag(db, action_id, tag.id)
     return RedirectResponse(url=f"/ui/actions/{action_id}", status_code=303)
 
 
@@ -623,8 +621,7 @@ def remove_action_tag(
     user = _current_user(request)
     enforce_write_access(user)
     enforce_action_ownership(user, action)
-    action.tags = [tag for tag in action.tags if tag.id != tag_id]
-    actions_repo.update_action(db, action)
+    actions_repo.remove_action_tag(db, action_id, tag_id)
     return RedirectResponse(url=f"/ui/actions/{action_id}", status_code=303)
 
 
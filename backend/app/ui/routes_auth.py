@@ -3,13 +3,14 @@ from __future__ import annotations
 from pathlib import Path
 
 from fastapi import APIRouter, Depends, Form, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.core.security import create_session_token, verify_password
+from app.core.security import averify_password, create_session_token
 from app.db.session import get_db
 from app.repositories import users as users_repo
 from app.services import users as users_service
@@ -44,22 +45,23 @@ def _session_response(user_id: int, role: str) -> RedirectResponse:
         httponly=True,
         samesite="lax",
         secure=settings.session_cookie_secure,
-        max_age=settings.session_ttl_days * 24 * 60 * 60,
+        max_age=settings.session_ttl_seconds,
     )
     return response
 
 
 @router.post("/login", response_model=None)
-def login(
+async def login(
     request: Request,
     username: str = Form(...),
     password: str = Form(...),
     db: Session = Depends(get_db),
 ):
+    # Async so the bcrypt check runs under its own thread limiter; DB work stays off the event loop.
     if not settings.auth_enabled:
         return RedirectResponse(url="/ui", status_code=303)
     try:
-        user = users_repo.get_user_by_username(db, username)
+        user = await run_in_threadpool(users_repo.get_user_by_username, db, username)
     except OperationalError as exc:
         return HTMLResponse(
             content=(
@@ -76,7 +78,7 @@ def login(
             ),
             status_code=500,
         )
-    if not user or not user.is_active or not verify_password(password, user.password_hash):
+    if not user or not user.is_active or not await averify_password(password, user.password_hash):
         return templates.TemplateResponse(
             "login.html",
             {
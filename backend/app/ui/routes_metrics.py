@@ -23,7 +23,7 @@ def _load_daily_kpis(
     from_date: date | None,
     to_date: date | None,
 ) -> list[dict[str, object]]:
-    actions = actions_repo.list_actions_created_between(db, date_from=from_date, date_to=to_date)
+    actions = actions_repo.list_actions_created_between(db, date_from=from_date, date_to=to_date, kpi_only=True)
     subtasks = actions_repo.list_subtasks_for_actions(db, [action.id for action in actions])
     return build_daily_kpi_rows(actions, subtasks)
 
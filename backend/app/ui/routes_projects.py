@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from datetime import date, datetime, timedelta
+from datetime import date, timedelta
 from pathlib import Path
 
 from fastapi import APIRouter, Depends, Form, HTTPException, Query, Request
@@ -302,7 +302,6 @@ def add_project_action(
         level = "error"
     else:
         action.project_id = project_id
-        action.updated_at = datetime.utcnow()
         actions_repo.update_action(db, action)
         feedback = "Action assigned to project."
         level = "success"
@@ -347,7 +346,6 @@ def remove_project_action(
         level = "error"
     else:
         action.project_id = None
-        action.updated_at = datetime.utcnow()
         actions_repo.update_action(db, action)
         feedback = "Action unassigned from project."
         level = "success"
@@ -5,7 +5,7 @@ from urllib.parse import urlencode
 
 from app.models.action import Action
 from app.models.subtask import Subtask
-from app.services.metrics import calculate_action_days_late
+from app.services.metrics import calculate_action_days_late, group_subtasks_by_action
 
 
 def format_date(value: date | datetime | None) -> str:
@@ -22,13 +22,11 @@ def build_query_params(filters: dict[str, object]) -> str:
 
 
 def build_action_rows(actions: list[Action], subtasks: list[Subtask]) -> list[dict[str, object]]:
-    subtask_map: dict[int, list[Subtask]] = {}
-    for subtask in subtasks:
-        subtask_map.setdefault(subtask.action_id, []).append(subtask)
+    subtask_map = group_subtasks_by_action(subtasks)
 
     rows: list[dict[str, object]] = []
     for action in actions:
-        days_late = calculate_action_days_late(action, subtask_map.get(action.id, []))
+        days_late = calculate_action_days_late(action, subtask_map.get(action.id, ()))
         owner = action.owner or "—"
         champion = action.champion.full_name if action.champion else "Unassigned"
         if action.process_type == "moulding":
@@ -1,9 +1,24 @@
 from __future__ import annotations
 
-from datetime import date, datetime
+import json
+from datetime import date, datetime, timedelta
 
+import anyio.to_thread
+from sqlalchemy import event
+
+from app.core import cache
+from app.core.auth import require_auth
+from app.core.config import settings
+from app.main import create_app
 from app.models.action import Action
+from app.models.champion import Champion
 from app.models.project import Project
+from app.models.subtask import Subtask
+from app.models.tag import Tag
+from app.models.user import User
+from app.repositories import actions as actions_repo
+from app.schemas.project import ProjectRead
+from app.schemas.tag import TagRead
 
 
 def test_get_actions(client, db_session):
@@ -31,6 +46,26 @@ def test_get_actions(client, db_session):
     assert payload["items"][0]["title"] == "Reduce scrap"
 
 
+def test_stream_actions_returns_ndjson(client, db_session):
+    db_session.add_all(
+        [
+            Action(title="First", status="OPEN", created_at=datetime(2024, 1, 1, 8, 0, 0), due_date=date(2024, 1, 5)),
+            Action(title="Second", status="CLOSED", created_at=datetime(2024, 1, 2, 8, 0, 0)),
+        ]
+    )
+    db_session.commit()
+
+    response = client.get("/api/actions/stream", params={"status": "OPEN"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = response.text.splitlines()
+    assert len(lines) == 1
+    item = json.loads(lines[0])
+    assert item["title"] == "First"
+    assert item == client.get("/api/actions", params={"status": "OPEN"}).json()["items"][0]
+
+
 def test_get_actions_kpi(client, db_session):
     action = Action(
         title="Close on time",
@@ -51,6 +86,112 @@ def test_get_actions_kpi(client, db_session):
     assert payload["on_time_close_rate"] == 100.0
 
 
+def test_actions_list_is_cached_until_a_write_is_committed(client, db_session, monkeypatch):
+    db_session.add(Action(title="First", status="OPEN", created_at=datetime(2024, 1, 1, 8, 0, 0)))
+    db_session.commit()
+    calls = []
+    list_actions = actions_repo.list_actions
+
+    def counting_list_actions(*args, **kwargs):
+        calls.append(1)
+        return list_actions(*args, **kwargs)
+
+    monkeypatch.setattr(actions_repo, "list_actions", counting_list_actions)
+
+    assert client.get("/api/actions").json()["total"] == 1
+    assert client.get("/api/actions").json()["total"] == 1
+    assert len(calls) == 1
+
+    db_session.add(Action(title="Second", status="OPEN", created_at=datetime(2024, 1, 2, 8, 0, 0)))
+    db_session.commit()
+
+    assert client.get("/api/actions").json()["total"] == 2
+    assert len(calls) == 2
+
+
+def test_cached_actions_list_is_not_shared_between_users(client, db_session, monkeypatch):
+    db_session.add(Action(title="First", status="OPEN", created_at=datetime(2024, 1, 1, 8, 0, 0)))
+    db_session.commit()
+    calls = []
+    list_actions = actions_repo.list_actions
+
+    def counting_list_actions(*args, **kwargs):
+        calls.append(1)
+        return list_actions(*args, **kwargs)
+
+    monkeypatch.setattr(actions_repo, "list_actions", counting_list_actions)
+    current = {"user": User(id=1, username="alice", role="viewer")}
+    client.app.dependency_overrides[require_auth] = lambda: current["user"]
+
+    assert client.get("/api/actions").status_code == 200
+    assert client.get("/api/actions").status_code == 200
+    current["user"] = User(id=2, username="bob", role="admin")
+    assert client.get("/api/actions").status_code == 200
+    assert len(calls) == 2
+
+
+def test_response_cache_is_bounded_and_drops_expired_entries(monkeypatch):
+    monkeypatch.setattr(settings, "api_cache_max_entries", 2)
+    now = [100.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    cache.invalidate()
+    calls = []
+
+    def build(name):
+        calls.append(name)
+        return name
+
+    for name in ("a", "b", "c"):
+        cache.get_or_set(("test", name), lambda: build(name), ttl=10)
+    assert cache.get_or_set(("test", "c"), lambda: build("c"), ttl=10) == "c"
+    assert cache.get_or_set(("test", "a"), lambda: build("a"), ttl=10) == "a"
+    assert calls == ["a", "b", "c", "a"]
+
+    now[0] += 11
+    cache.get_or_set(("test", "d"), lambda: build("d"), ttl=10)
+    assert list(cache._entries) == [("test", "d")]
+
+
+def test_update_and_delete_subtask(client, db_session):
+    action = Action(title="Fix gate", status="OPEN", created_at=datetime(2024, 1, 1, 8, 0, 0))
+    db_session.add(action)
+    db_session.commit()
+    subtask = Subtask(action_id=action.id, title="Measure", status="OPEN")
+    db_session.add(subtask)
+    db_session.commit()
+
+    response = client.patch(f"/api/actions/subtasks/{subtask.id}", json={"status": "DONE"})
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "DONE"
+
+    response = client.delete(f"/api/actions/subtasks/{subtask.id}")
+
+    assert response.status_code == 204
+    assert actions_repo.list_subtasks(db_session, action.id) == []
+    assert client.delete(f"/api/actions/subtasks/{subtask.id}").status_code == 404
+
+
+def test_add_and_remove_action_tag(client, db_session):
+    action = Action(title="Tagged", status="OPEN", created_at=datetime(2024, 1, 1, 8, 0, 0))
+    tag = Tag(name="Safety")
+    db_session.add_all([action, tag])
+    db_session.commit()
+
+    first = client.post(f"/api/actions/{action.id}/tags/{tag.id}")
+    second = client.post(f"/api/actions/{action.id}/tags/{tag.id}")
+
+    assert first.status_code == 200
+    assert [item["name"] for item in second.json()["tags"]] == ["Safety"]
+    assert client.post(f"/api/actions/{action.id}/tags/999").status_code == 404
+
+    response = client.delete(f"/api/actions/{action.id}/tags/{tag.id}")
+
+    assert response.status_code == 200
+    assert response.json()["tags"] == []
+    assert client.delete(f"/api/actions/999/tags/{tag.id}").status_code == 404
+
+
 def test_project_actions_assign_and_unassign(client, db_session):
     project = Project(name="Project One", status="OPEN")
     db_session.add(project)
@@ -61,6 +202,7 @@ def test_project_actions_assign_and_unassign(client, db_session):
         description="Test",
         status="OPEN",
         created_at=datetime.utcnow(),
+        updated_at=datetime(2024, 1, 1, 8, 0, 0),
     )
     db_session.add(action)
     db_session.commit()
@@ -68,6 +210,7 @@ def test_project_actions_assign_and_unassign(client, db_session):
     assign_response = client.post(f"/api/projects/{project.id}/actions/{action.id}")
     assert assign_response.status_code == 200
     assert assign_response.json()["project_id"] == project.id
+    assert datetime.fromisoformat(assign_response.json()["updated_at"]) > datetime(2024, 1, 1, 8, 0, 0)
 
     list_response = client.get(f"/api/projects/{project.id}/actions")
     assert list_response.status_code == 200
@@ -97,7 +240,98 @@ def test_assigning_action_in_other_project_returns_conflict(client, db_session):
     response = client.post(f"/api/projects/{project_2.id}/actions/{action.id}")
 
     assert response.status_code == 409
-    assert "Action is already assigned to project" in response.json()["detail"]
+    assert response.json()["detail"] == f"Action is already assigned to project Project One ({project_1.id})"
+
+
+def test_list_project_actions_query_count_does_not_grow_with_actions(client, db_session):
+    project = Project(name="Busy project", status="OPEN")
+    champion = Champion(first_name="Ada", last_name="Lovelace")
+    db_session.add_all([project, champion])
+    db_session.flush()
+
+    def count_statements() -> int:
+        statements: list[str] = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        engine = db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            db_session.expire_all()
+            response = client.get(f"/api/projects/{project.id}/actions")
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        assert response.status_code == 200
+        return len(statements)
+
+    def add_actions(indexes: range) -> None:
+        for index in indexes:
+            action = Action(
+                title=f"Action {index}",
+                status="OPEN",
+                project_id=project.id,
+                champion_id=champion.id,
+                created_at=datetime(2024, 1, 1, 8, 0, 0),
+            )
+            action.tags = [Tag(name=f"Tag {index}")]
+            db_session.add(action)
+        db_session.commit()
+
+    add_actions(range(2))
+    baseline = count_statements()
+    add_actions(range(2, 10))
+
+    assert count_statements() == baseline
+
+
+def test_project_and_tag_reads_match_validated_models(client, db_session):
+    project = Project(name="Line B", status="OPEN", due_date=date(2024, 3, 1), max_volume=1000, flex_percent=10.0)
+    tag = Tag(name="Quality", color="#2563eb")
+    db_session.add_all([project, tag])
+    db_session.commit()
+
+    projects_response = client.get("/api/projects")
+    project_response = client.get(f"/api/projects/{project.id}")
+    tags_response = client.get("/api/tags")
+
+    assert projects_response.json() == [ProjectRead.model_validate(project).model_dump(mode="json")]
+    assert project_response.json() == ProjectRead.model_validate(project).model_dump(mode="json")
+    assert tags_response.json() == [TagRead.model_validate(tag).model_dump(mode="json")]
+
+
+def test_list_project_actions_days_late_uses_subtasks(client, db_session):
+    project = Project(name="Late project", status="OPEN")
+    db_session.add(project)
+    db_session.flush()
+    with_subtasks = Action(
+        title="With subtasks",
+        status="OPEN",
+        project_id=project.id,
+        created_at=datetime(2024, 1, 1, 8, 0, 0),
+        due_date=date.today() + timedelta(days=30),
+    )
+    without_subtasks = Action(
+        title="Without subtasks",
+        status="OPEN",
+        project_id=project.id,
+        created_at=datetime(2024, 1, 1, 8, 0, 0),
+        due_date=date.today() - timedelta(days=4),
+    )
+    db_session.add_all([with_subtasks, without_subtasks])
+    db_session.flush()
+    db_session.add(
+        Subtask(action_id=with_subtasks.id, title="Late", status="OPEN", due_date=date.today() - timedelta(days=2))
+    )
+    db_session.commit()
+
+    response = client.get(f"/api/projects/{project.id}/actions")
+
+    assert response.status_code == 200
+    assert {item["title"]: item["days_late"] for item in response.json()} == {
+        "With subtasks": 2,
+        "Without subtasks": 4,
+    }
 
 
 def test_unassigned_actions_search_filter(client, db_session):
@@ -218,6 +452,25 @@ def test_create_action_with_process_type(client):
     assert payload["process_type"] == "assembly"
 
 
+def test_create_action_reuses_and_creates_tags(client, db_session):
+    db_session.add(Tag(name="Safety"))
+    db_session.commit()
+
+    response = client.post(
+        "/api/actions",
+        json={
+            "title": "Tagged action",
+            "status": "OPEN",
+            "process_type": "assembly",
+            "tags": ["safety", "Scrap", " SCRAP "],
+        },
+    )
+
+    assert response.status_code == 201
+    assert [tag["name"] for tag in response.json()["tags"]] == ["Safety", "Scrap"]
+    assert sorted(tag.name for tag in db_session.query(Tag).all()) == ["Safety", "Scrap"]
+
+
 def test_create_action_rejects_invalid_process_type(client):
     response = client.post(
         "/api/actions",
@@ -230,3 +483,25 @@ def test_create_action_rejects_invalid_process_type(client):
 
     assert response.status_code == 422
     assert "Invalid process_type" in response.json()["detail"]
+
+
+def test_startup_sizes_worker_thread_pool(client, monkeypatch):
+    monkeypatch.setattr(settings, "worker_threads", 64)
+
+    with client:
+        limiter = client.portal.call(anyio.to_thread.current_default_thread_limiter)
+
+    assert limiter.total_tokens == 64
+
+
+def test_api_routers_only_require_auth_when_enabled(monkeypatch):
+    def router_dependencies(app):
+        route = next(route for route in app.routes if getattr(route, "path", None) == "/api/actions")
+        return [dependency.dependency for dependency in route.dependencies]
+
+    monkeypatch.setattr(settings, "auth_enabled", False)
+    assert require_auth not in router_dependencies(create_app())
+
+    monkeypatch.setattr(settings, "auth_enabled", True)
+    monkeypatch.setattr(settings, "secret_key", "test-secret")
+    assert require_auth in router_dependencies(create_app())
@@ -1,6 +1,14 @@
 from __future__ import annotations
 
-from app.main import BlockedModeState
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import main
+from app.db.base import Base
+from app.main import BlockedModeState, SchemaValidationResult
+from app.repositories import labour_costs as labour_costs_repo
+from app.services.settings import LABOUR_COST_WORKER_TYPES
 
 
 def _blocked_state() -> BlockedModeState:
@@ -13,10 +21,15 @@ def _blocked_state() -> BlockedModeState:
 
 
 def test_health_reports_ok_when_not_blocked(client):
+    background = main.HEALTH_OK_RESPONSE.background
     response = client.get("/health")
+    again = client.get("/health")
 
     assert response.status_code == 200
     assert response.json() == {"status": "ok"}
+    assert again.json() == {"status": "ok"}
+    assert response.headers["content-type"] == "application/json"
+    assert main.HEALTH_OK_RESPONSE.background is background
 
 
 def test_health_reports_blocked_payload_when_blocked(client):
@@ -67,3 +80,59 @@ def test_blocked_mode_allows_docs_and_openapi_paths(client):
 
     assert docs_response.status_code == 200
     assert openapi_response.status_code == 200
+
+
+def test_blocked_page_is_rerendered_when_blocked_state_changes(client):
+    client.app.state.blocked_mode = _blocked_state()
+    first = client.get("/blocked")
+    again = client.get("/blocked")
+
+    client.app.state.blocked_mode = BlockedModeState(
+        is_blocked=True,
+        database_url="sqlite:///other.db",
+        missing_revisions=["5678efgh"],
+        missing_by_table={},
+    )
+    changed = client.get("/blocked")
+
+    assert again.text == first.text
+    assert "1234abcd" in first.text
+    assert "5678efgh" in changed.text
+    assert "sqlite:///other.db" in changed.text
+
+
+def test_lifespan_sets_blocked_state_and_seeds_startup_rows(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'startup.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(main, "engine", engine)
+    monkeypatch.setattr(main, "SessionLocal", session_factory)
+    monkeypatch.setattr(main, "_log_settings_ui_module_path", lambda: None)
+    monkeypatch.setattr(
+        main,
+        "validate_dev_schema",
+        lambda _engine: SchemaValidationResult(
+            is_valid=False,
+            database_url="sqlite:///startup.db",
+            missing_revisions=["0099"],
+            missing_by_table={},
+        ),
+    )
+
+    with TestClient(main.create_app(initialize_database=True)) as client:
+        response = client.get("/health")
+
+    assert response.json()["status"] == "blocked"
+    assert engine.pool.checkedout() == 0
+    with session_factory() as db:
+        rows = labour_costs_repo.list_labour_costs(db, LABOUR_COST_WORKER_TYPES)
+    assert {row.worker_type for row in rows} == set(LABOUR_COST_WORKER_TYPES)
+    engine.dispose()
+
+
+def test_blocked_state_is_unset_until_startup_and_reads_as_not_blocked(client):
+    assert client.app.state.blocked_mode is None
+
+    assert client.get("/api/tags", follow_redirects=False).status_code == 200
+    assert client.get("/health").json() == {"status": "ok"}
+    assert "Application is running in BLOCKED MODE" in client.get("/blocked").text
@@ -6,6 +6,7 @@ import pytest
 from sqlalchemy import create_engine, text
 
 from app.core.config import settings
+from app.db.session import get_engine, warm_pool
 from app.main import _build_schema_error_message, validate_dev_schema
 
 
@@ -55,3 +56,40 @@ def test_validate_dev_schema_raises_outside_dev_mode(tmp_path, monkeypatch):
     monkeypatch.setattr(settings, "dev_mode", False)
     with pytest.raises(RuntimeError, match="BLOCKED MODE"):
         validate_dev_schema(engine)
+
+
+def test_sqlite_engine_applies_connection_pragmas(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "database_url", f"sqlite:///{tmp_path / 'pragmas.db'}")
+    engine = get_engine()
+
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar_one() == "wal"
+        assert connection.execute(text("PRAGMA synchronous")).scalar_one() == 1
+        assert connection.execute(text("PRAGMA temp_store")).scalar_one() == 2
+        assert connection.execute(text("PRAGMA cache_size")).scalar_one() == -64000
+    engine.dispose()
+
+
+def test_warm_pool_opens_pool_size_connections(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "database_url", f"sqlite:///{tmp_path / 'warm.db'}")
+    engine = get_engine()
+
+    warm_pool(engine)
+
+    assert engine.pool.checkedin() == engine.pool.size()
+    assert engine.pool.checkedout() == 0
+    engine.dispose()
+
+
+def test_validate_dev_schema_rechecks_columns_on_every_call(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'repeat.db'}", connect_args={"check_same_thread": False})
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE actions (id INTEGER PRIMARY KEY)"))
+
+    assert validate_dev_schema(engine).missing_by_table == {"actions": ["process_type", "updated_at"]}
+
+    with engine.begin() as connection:
+        connection.execute(text("ALTER TABLE actions ADD COLUMN updated_at DATETIME"))
+
+    assert validate_dev_schema(engine).missing_by_table == {"actions": ["process_type"]}
+    engine.dispose()
@@ -142,3 +142,92 @@ def test_build_actions_kpi():
     assert kpi["on_time_close_rate"] == 100.0
     assert kpi["avg_time_to_close_days"] == 7.0
     assert kpi["sum_days_late"] == 3
+
+
+def test_days_late_by_action_matches_python_metrics(db_session):
+    from app.repositories import actions as actions_repo
+
+    today = date(2024, 1, 7)
+    with_subtasks = Action(
+        title="With subtasks",
+        status="OPEN",
+        created_at=datetime(2024, 1, 1, 8, 0, 0),
+        due_date=date(2024, 1, 10),
+    )
+    overdue = Action(title="Overdue", status="OPEN", created_at=datetime(2024, 1, 1), due_date=date(2024, 1, 5))
+    closed_late = Action(
+        title="Closed late",
+        status="CLOSED",
+        created_at=datetime(2024, 1, 1),
+        due_date=date(2024, 1, 2),
+        closed_at=datetime(2024, 1, 4, 23, 30, 0),
+    )
+    no_due_date = Action(title="No due date", status="OPEN", created_at=datetime(2024, 1, 1))
+    db_session.add_all([with_subtasks, overdue, closed_late, no_due_date])
+    db_session.flush()
+    subtasks = [
+        Subtask(action_id=with_subtasks.id, title="A", status="OPEN", due_date=date(2024, 1, 5)),
+        Subtask(
+            action_id=with_subtasks.id,
+            title="B",
+            status="DONE",
+            due_date=date(2024, 1, 3),
+            closed_at=datetime(2024, 1, 4, 9, 0, 0),
+        ),
+        Subtask(action_id=with_subtasks.id, title="C", status="OPEN"),
+    ]
+    db_session.add_all(subtasks)
+    db_session.commit()
+
+    actions = [with_subtasks, overdue, closed_late, no_due_date]
+    days_late = actions_repo.days_late_by_action(db_session, [action.id for action in actions], today=today)
+
+    assert days_late == {
+        action.id: calculate_action_days_late(
+            action, [subtask for subtask in subtasks if subtask.action_id == action.id], today=today
+        )
+        for action in actions
+    }
+    assert days_late[with_subtasks.id] == 3
+
+
+def test_aggregate_kpi_matches_build_actions_kpi(db_session):
+    from app.repositories import actions as actions_repo
+
+    today = date(2024, 1, 20)
+    actions = [
+        Action(title="Open overdue", status="OPEN", created_at=datetime(2024, 1, 1, 8, 0, 0), due_date=date(2024, 1, 5)),
+        Action(title="Open later", status="OPEN", created_at=datetime(2024, 1, 2, 8, 0, 0), due_date=date(2024, 2, 1)),
+        Action(
+            title="Closed on time",
+            status="CLOSED",
+            created_at=datetime(2024, 1, 1, 10, 0, 0),
+            due_date=date(2024, 1, 10),
+            closed_at=datetime(2024, 1, 4, 9, 0, 0),
+        ),
+        Action(
+            title="Closed late",
+            status="closed",
+            created_at=datetime(2024, 1, 3, 8, 0, 0),
+            due_date=date(2024, 1, 5),
+            closed_at=datetime(2024, 1, 9, 17, 0, 0),
+        ),
+        Action(title="No due date", status="CLOSED", created_at=datetime(2024, 1, 1), closed_at=datetime(2024, 1, 2)),
+    ]
+    db_session.add_all(actions)
+    db_session.flush()
+    subtasks = [
+        Subtask(action_id=actions[1].id, title="A", status="OPEN", due_date=date(2024, 1, 15)),
+        Subtask(
+            action_id=actions[1].id,
+            title="B",
+            status="DONE",
+            due_date=date(2024, 1, 3),
+            closed_at=datetime(2024, 1, 6, 9, 0, 0),
+        ),
+    ]
+    db_session.add_all(subtasks)
+    db_session.commit()
+
+    assert actions_repo.aggregate_kpi(db_session, today=today) == build_actions_kpi(actions, subtasks, today=today)
+    assert actions_repo.aggregate_kpi(db_session, statuses=["NONE"], today=today) == build_actions_kpi([], [], today=today)
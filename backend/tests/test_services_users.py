@@ -1,9 +1,20 @@
 from __future__ import annotations
 
 import pytest
-
-from app.core.security import verify_password
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.core.auth import (
+    enforce_action_create_permission,
+    enforce_action_ownership,
+    get_current_user_optional,
+    require_role_admin,
+)
+from app.core.config import settings
+from app.core.security import create_session_token, decode_session_token, verify_password
+from app.models.action import Action
 from app.models.user import User
+from app.repositories import users as users_repo
 from app.services import users as users_service
 
 
@@ -55,3 +66,130 @@ def test_upsert_user_role_rejects_invalid_role(db_session):
 
     with pytest.raises(ValueError, match="Role must be one of"):
         users_service.upsert_user_role(db_session, user_id=user.id, email=user.email, role="owner")
+
+
+def test_session_token_round_trip_follows_secret_key(monkeypatch):
+    monkeypatch.setattr(settings, "secret_key", "first-secret")
+    token = create_session_token(7, "admin")
+
+    assert decode_session_token(token, max_age_seconds=60) == {"uid": 7, "role": "admin"}
+
+    monkeypatch.setattr(settings, "secret_key", "rotated-secret")
+
+    assert decode_session_token(token, max_age_seconds=60) is None
+
+
+def _session_request(token: str) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "headers": [(b"cookie", f"{settings.session_cookie_name}={token}".encode())],
+            "state": {},
+        }
+    )
+
+
+def test_current_user_is_resolved_once_per_request(db_session, monkeypatch):
+    monkeypatch.setattr(settings, "auth_enabled", True)
+    monkeypatch.setattr(settings, "secret_key", "test-secret")
+    user = users_service.create_user(db_session, "alice", "super-secret", dev_mode=True)
+    token = create_session_token(user.id, user.role)
+    request = _session_request(token)
+    lookups: list[int] = []
+    get_user_by_id = users_repo.get_user_by_id
+
+    def counting_get_user_by_id(db, user_id):
+        lookups.append(user_id)
+        return get_user_by_id(db, user_id)
+
+    monkeypatch.setattr(users_repo, "get_user_by_id", counting_get_user_by_id)
+
+    assert get_current_user_optional(request, db_session) is user
+    assert get_current_user_optional(request, db_session) is user
+    assert lookups == [user.id]
+
+
+def test_session_user_lookup_is_cached_until_a_write_commits(db_session, monkeypatch):
+    monkeypatch.setattr(settings, "auth_enabled", True)
+    monkeypatch.setattr(settings, "secret_key", "test-secret")
+    user = users_service.create_user(db_session, "bob", "super-secret", dev_mode=True)
+    token = create_session_token(user.id, user.role)
+    lookups: list[int] = []
+    get_user_by_id = users_repo.get_user_by_id
+
+    def counting_get_user_by_id(db, user_id):
+        lookups.append(user_id)
+        return get_user_by_id(db, user_id)
+
+    monkeypatch.setattr(users_repo, "get_user_by_id", counting_get_user_by_id)
+
+    assert get_current_user_optional(_session_request(token), db_session) is user
+    assert get_current_user_optional(_session_request(token), db_session) is user
+    assert lookups == [user.id]
+
+    user.is_active = False
+    db_session.commit()
+
+    assert get_current_user_optional(_session_request(token), db_session) is None
+    assert lookups == [user.id, user.id]
+
+
+def test_blake2b_session_tokens_round_trip_and_reject_other_algorithm(monkeypatch):
+    monkeypatch.setattr(settings, "secret_key", "test-secret")
+    legacy_token = create_session_token(7, "admin")
+
+    monkeypatch.setattr(settings, "session_token_blake2b", True)
+    token = create_session_token(7, "admin")
+
+    assert token != legacy_token
+    assert decode_session_token(token, max_age_seconds=60) == {"uid": 7, "role": "admin"}
+    assert decode_session_token(legacy_token, max_age_seconds=60) is None
+    signed, signature = token.rsplit(".", 1)
+    tampered = f"{signed}.{'A' if signature[0] != 'A' else 'B'}{signature[1:]}"
+    assert decode_session_token(tampered, max_age_seconds=60) is None
+
+
+@pytest.mark.parametrize(
+    ("role", "user_champion_id", "action_champion_id", "allowed"),
+    [
+        ("admin", None, 3, True),
+        ("champion", 3, 3, True),
+        ("champion", 3, 4, False),
+        ("champion", None, None, False),
+        ("viewer", 3, 3, False),
+    ],
+)
+def test_action_ownership_and_create_permission_share_one_rule(
+    monkeypatch, role, user_champion_id, action_champion_id, allowed
+):
+    monkeypatch.setattr(settings, "auth_enabled", True)
+    user = User(username="u", email="u@example.com", password_hash="x", role=role, champion_id=user_champion_id)
+    action = Action(title="A", status="OPEN", champion_id=action_champion_id)
+
+    for check in (
+        lambda: enforce_action_ownership(user, action),
+        lambda: enforce_action_create_permission(user, action_champion_id),
+    ):
+        if allowed:
+            check()
+        else:
+            with pytest.raises(HTTPException) as exc_info:
+                check()
+            assert exc_info.value.status_code == 403
+
+
+def test_require_role_admin_resolves_and_checks_role(db_session, monkeypatch):
+    monkeypatch.setattr(settings, "auth_enabled", True)
+    monkeypatch.setattr(settings, "secret_key", "test-secret")
+    viewer = users_service.create_user(db_session, "viewer", "super-secret", dev_mode=True)
+    admin = users_service.create_user(db_session, "admin", "super-secret", dev_mode=True)
+    admin.role = "admin"
+    db_session.commit()
+
+    assert require_role_admin(_session_request(create_session_token(admin.id, admin.role)), db_session) is admin
+    with pytest.raises(HTTPException) as exc_info:
+        require_role_admin(_session_request(create_session_token(viewer.id, viewer.role)), db_session)
+    assert exc_info.value.status_code == 403
+    with pytest.raises(HTTPException) as exc_info:
+        require_role_admin(_session_request(""), db_session)
+    assert exc_info.value.status_code == 401
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import logging
 from datetime import date, datetime
 
 from sqlalchemy.exc import OperationalError
@@ -14,6 +15,7 @@ from app.schemas.material import MaterialCreate
 from app.schemas.metalization import MetalizationChamberCreate, MetalizationMaskCreate
 from app.schemas.moulding import MouldingMachineCreate, MouldingToolCreate
 from app.services import settings as settings_service
+from app.services import users as users_service
 
 
 def test_ui_settings_page(client):
@@ -80,6 +82,43 @@ def test_ui_action_detail_shows_unassigned_when_champion_deleted(client, db_sess
     assert "Unassigned" in response.text
 
 
+def test_ui_kpi_page_lists_daily_rows(client, db_session):
+    db_session.add(
+        Action(
+            title="Late action",
+            description="Long description",
+            status="OPEN",
+            created_at=datetime(2024, 1, 1, 8, 0, 0),
+            due_date=date(2024, 1, 5),
+        )
+    )
+    db_session.commit()
+    db_session.expunge_all()
+
+    response = client.get("/ui/kpi")
+
+    assert response.status_code == 200
+    assert "2024-01-01" in response.text
+
+
+def test_ui_action_add_and_remove_tag(client, db_session):
+    action = Action(title="Tag me", status="OPEN", created_at=datetime(2024, 1, 1, 8, 0, 0))
+    db_session.add(action)
+    db_session.commit()
+
+    for _ in range(2):
+        response = client.post(f"/ui/actions/{action.id}/tags", data={"tag_name": "Quality"}, follow_redirects=False)
+        assert response.status_code == 303
+    db_session.expire_all()
+    assert [tag.name for tag in action.tags] == ["Quality"]
+
+    response = client.post(f"/ui/actions/{action.id}/tags/{action.tags[0].id}/delete", follow_redirects=False)
+
+    assert response.status_code == 303
+    db_session.expire_all()
+    assert action.tags == []
+
+
 def test_ui_analyses_page(client, monkeypatch, tmp_path):
     monkeypatch.setenv("CAPA_DATA_DIR", str(tmp_path))
 
@@ -134,6 +173,75 @@ def test_login_shows_schema_error_when_users_email_missing(client, monkeypatch):
     assert "alembic upgrade head" in response.text
 
 
+def test_ui_auth_gate_redirects_anonymous_requests_except_public_pages(client, monkeypatch):
+    monkeypatch.setattr(settings, "auth_enabled", True)
+    monkeypatch.setattr(settings, "secret_key", "test-secret")
+
+    page = client.get("/ui", follow_redirects=False)
+    htmx = client.get("/ui", headers={"HX-Request": "true"}, follow_redirects=False)
+    login = client.get("/ui/login", follow_redirects=False)
+
+    assert page.status_code == 302
+    assert page.headers["location"] == "/login"
+    assert htmx.status_code == 401
+    assert htmx.headers["HX-Redirect"] == "/login"
+    assert login.status_code == 200
+
+
+def test_signed_in_ui_request_resolves_user_from_request_session(client, db_session, monkeypatch):
+    monkeypatch.setattr(settings, "auth_enabled", True)
+    monkeypatch.setattr(settings, "secret_key", "test-secret")
+    users_service.create_user(db_session, "alice", "super-secret", dev_mode=True)
+    client.post("/ui/login", data={"username": "alice", "password": "super-secret"}, follow_redirects=False)
+
+    response = client.get("/ui/settings", follow_redirects=False)
+    login_page = client.get("/ui/login", follow_redirects=False)
+
+    assert response.status_code == 200
+    assert "Signed in as" in response.text
+    assert login_page.status_code == 303
+    assert login_page.headers["location"] == "/ui"
+
+
+def test_unhandled_ui_error_renders_error_page_and_is_logged(client, caplog):
+    @client.app.get("/ui/boom")
+    def boom():
+        raise RuntimeError("kaboom")
+
+    with caplog.at_level(logging.INFO, logger="app.request"):
+        response = client.get("/ui/boom")
+        client.get("/login", follow_redirects=False)
+        client.get("/health")
+
+    assert response.status_code == 500
+    assert "CAPA UI Error" in response.text
+    assert "RuntimeError:</strong> kaboom" in response.text
+    assert "Unhandled UI exception for /ui/boom" in caplog.text
+    assert "GET /ui/boom -> 500" in caplog.text
+    assert "GET /login -> 302" in caplog.text
+    assert "GET /health" not in caplog.text
+
+    caplog.clear()
+    with caplog.at_level(logging.WARNING, logger="app.request"):
+        client.get("/login", follow_redirects=False)
+
+    assert "GET /login" not in caplog.text
+
+
+def test_login_verifies_password_and_sets_session_cookie(client, db_session, monkeypatch):
+    monkeypatch.setattr(settings, "auth_enabled", True)
+    monkeypatch.setattr(settings, "secret_key", "test-secret")
+    users_service.create_user(db_session, "alice", "super-secret", dev_mode=True)
+
+    rejected = client.post("/ui/login", data={"username": "alice", "password": "wrong-secret"}, follow_redirects=False)
+    accepted = client.post("/ui/login", data={"username": "alice", "password": "super-secret"}, follow_redirects=False)
+
+    assert rejected.status_code == 401
+    assert "Invalid username or password." in rejected.text
+    assert accepted.status_code == 303
+    assert settings.session_cookie_name in accepted.cookies
+
+
 def test_action_detail_edit_contains_project_select(client, db_session):
     project = Project(name="Project A", status="OPEN")
     action = Action(title="Action A", status="OPEN", created_at=datetime.utcnow())